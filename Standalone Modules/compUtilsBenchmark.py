@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# CompUtils Benchmark - Timing CompUtils end to end without ever touching a real cluster
+# Builds synthetic Gaussian16, ORCA, and GoodVibes outputs in a scratch directory, fakes sbatch, squeue, and sacct, and
+# times startup and the hot subroutines of CompUtils against them. Results are saved as JSON so that two versions can
+# be compared with --compare
+
+import os
+import sys
+import time
+import json
+import random
+import shutil
+import socket
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+import importlib.util
+
+# Where CompUtils lives relative to this module, unless told otherwise
+defaultCompUtils = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "compUtils.py")
+
+# Stand-ins for the SLURM commands. Nothing is ever queued, so every stalked job has already left the queue
+fakeCommands = {
+    "sbatch": "#!/bin/sh\necho $$\n",
+    "squeue": "#!/bin/sh\nexit 0\n",
+    "sacct": "#!/bin/sh\nexit 0\n",
+}
+benchmarkingLines = ["M062X 6-311+G(d,p) scrf=(smd,solvent=TetraHydroFuran)", "wB97XD def2TZVP",
+                     "DLPNO-CCSD(T) def2-TZVP def2-TZVP/c"]
+programLines = ["M062X G16", "wB97XD G16", "DLPNO-CCSD(T) O"]
+elementCycle = [6, 1, 8, 7, 1, 16, 1, 6, 9, 1]
+
+# Writes one Gaussian16 orientation block, SCF energy, and convergence table per optimization step
+def gaussianOutput(fileName, atoms, steps, termination="Normal"):
+    random.seed(atoms)
+    geometry = [(elementCycle[atom % len(elementCycle)], random.uniform(-10, 10), random.uniform(-10, 10),
+                 random.uniform(-10, 10)) for atom in range(atoms)]
+    dashes = " " + "-" * 69 + "\n"
+    with open(fileName, "w") as outFile:
+        outFile.write(" Entering Gaussian System\n %nprocshared=12\n Will use up to   12 processors via shared memory.\n")
+        outFile.write(dashes + " # opt freq m062x/6-311+g(d,p)\n" + dashes)
+        outFile.write(" Symbolic Z-matrix:\n Charge =  0 Multiplicity = 1\n")
+        for step in range(steps):
+            outFile.write("                         Standard orientation:                         \n" + dashes)
+            outFile.write(" Center     Atomic      Atomic             Coordinates (Angstroms)\n")
+            outFile.write(" Number     Number       Type             X           Y           Z\n" + dashes)
+            shift = step * 0.001
+            outFile.write("".join("  %5d  %9d  %10d  %14.6f %11.6f %11.6f\n" % (center + 1, atom[0], 0, atom[1] + shift,
+                                                                                 atom[2], atom[3])
+                                  for center, atom in enumerate(geometry)))
+            outFile.write(dashes)
+            outFile.write(" SCF Done:  E(RM062X) =  -%.9f     A.U. after   12 cycles\n" % (1000 + step * 0.0001))
+            outFile.write("         Item               Value     Threshold  Converged?\n"
+                          " Maximum Force            0.000010     0.000450     YES\n"
+                          " RMS     Force            0.000005     0.000300     YES\n"
+                          " Maximum Displacement     0.000100     0.001800     NO \n"
+                          " RMS     Displacement     0.000050     0.001200     NO \n")
+        if termination == "Normal":
+            outFile.write(" Elapsed time:       0 days  1 hours  2 minutes  3.0 seconds.\n")
+            outFile.write(" Normal termination of Gaussian 16 at Mon Oct 27 10:00:00 2025.\n")
+
+# Number of optimization steps needed for an output of roughly the given size
+def stepsForSize(atoms, megabytes):
+    stepBytes = 400 + 70 * atoms + 450
+    return max(1, int(megabytes * 1024 * 1024 / stepBytes))
+
+# ORCA outputs only need to be recognised as finished by the stalker
+def orcaOutput(fileName, atoms):
+    with open(fileName, "w") as outFile:
+        outFile.write("                                 * O   R   C   A *\n")
+        outFile.write("CARTESIAN COORDINATES (ANGSTROEM)\n---------------------------------\n")
+        for atom in range(atoms):
+            outFile.write("  C     %10.6f   %10.6f   %10.6f\n" % (atom * 0.1, 0.0, 0.0))
+        outFile.write("FINAL SINGLE POINT ENERGY      -1000.123456789\n")
+        outFile.write("                             ****ORCA TERMINATED NORMALLY****\n")
+        outFile.write("TOTAL RUN TIME: 0 days 0 hours 3 minutes 12 seconds 0 msec\n")
+
+# A GoodVibes table in the layout goodVibesProcessor expects
+def goodVibesOutput(fileName, structures):
+    columns = ["Structure", "E", "ZPE", "H", "T.S", "T.qh-S", "G(T)", "qh-G(T)"]
+    stars = "   " + "*" * 120 + "\n"
+    with open(fileName, "w") as outFile:
+        outFile.write("   GoodVibes v3.2\n\n")
+        outFile.write("   " + "".join(column.rjust(14) for column in columns) + "\n" + stars)
+        for structure in range(structures):
+            values = [-1000 + structure * 0.01, 0.2, -999.7, 0.05, 0.049, -999.8, -999.79]
+            outFile.write("o  " + ("mol" + str(structure)).ljust(14) + "".join("%14.6f" % value for value in values) + "\n")
+        outFile.write(stars)
+
+# Sets up a scratch HOME with ~/bin configuration and the fake SLURM commands on PATH
+def scratchEnvironment(scratch):
+    binDirectory = os.path.join(scratch, "home", "bin")
+    fakeDirectory = os.path.join(scratch, "fakebin")
+    os.makedirs(binDirectory)
+    os.makedirs(fakeDirectory)
+    with open(os.path.join(binDirectory, "hpc.type"), "w") as hpcFile:
+        hpcFile.write("H2P")
+    with open(os.path.join(binDirectory, "benchmarking.txt"), "w") as methodFile:
+        methodFile.write("\n".join(benchmarkingLines) + "\n")
+    with open(os.path.join(binDirectory, "programs.txt"), "w") as programFile:
+        programFile.write("\n".join(programLines) + "\n")
+    for command, script in fakeCommands.items():
+        commandPath = os.path.join(fakeDirectory, command)
+        with open(commandPath, "w") as commandFile:
+            commandFile.write(script)
+        os.chmod(commandPath, 0o755)
+    os.environ["HOME"] = os.path.join(scratch, "home")
+    os.environ["PATH"] = fakeDirectory + os.pathsep + os.environ["PATH"]
+    workDirectory = os.path.join(scratch, "work")
+    os.makedirs(workDirectory)
+    os.chdir(workDirectory)
+
+# Imports CompUtils from a path without running its command line, after the scratch HOME is in place
+def loadCompUtils(compUtilsPath):
+    spec = importlib.util.spec_from_file_location("compUtils", compUtilsPath)
+    compUtils = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(compUtils)
+    if hasattr(compUtils, "loadConfiguration"):
+        compUtils.loadConfiguration()
+    return compUtils
+
+# Times a callable, quietly, with a fresh setup before every repeat
+def timeCall(function, repeats, setup=None):
+    times = []
+    with open(os.devnull, "w") as devNull, contextlib.redirect_stdout(devNull):
+        for repeat in range(repeats):
+            arguments = setup() if setup is not None else ()
+            startTime = time.perf_counter()
+            function(*arguments)
+            times.append(time.perf_counter() - startTime)
+    return times
+
+# Times a whole CompUtils process, which is the only honest measure of startup
+def timeProcess(command, repeats):
+    times = []
+    for repeat in range(repeats):
+        startTime = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - startTime)
+    return times
+
+def summarise(name, parameters, times):
+    result = {"name": name, "parameters": parameters, "times": times, "min": min(times),
+              "median": statistics.median(times), "mean": statistics.fmean(times)}
+    label = name + " " + " ".join(key + "=" + str(value) for key, value in parameters.items())
+    print(label.ljust(60) + ("%.4f s" % result["median"]).rjust(14) + ("(min %.4f s)" % result["min"]).rjust(18))
+    return result
+
+def runBenchmarks(compUtilsPath, atomCounts, outputSizes, structureCounts, stalkCount, repeats):
+    results = []
+
+    # Startup is timed first, as a separate process, before anything is cached in this one
+    results.append(summarise("startup", {"command": "--help"},
+                             timeProcess([sys.executable, compUtilsPath, "--help"], repeats)))
+    results.append(summarise("startup", {"command": "-r"},
+                             timeProcess([sys.executable, compUtilsPath, "-r", "nothing.gjf"], repeats)))
+    startTime = time.perf_counter()
+    compUtils = loadCompUtils(compUtilsPath)
+    results.append(summarise("import", {}, [time.perf_counter() - startTime]))
+    orcaIndex = compUtils.methodLine.index("DLPNO-CCSD(T)")
+
+    # Per-structure costs, scaling with the number of atoms
+    for atoms in atomCounts:
+        outputName = "atoms" + str(atoms) + ".log"
+        gaussianOutput(outputName, atoms, 3)
+        parameters = {"atoms": atoms}
+        results.append(summarise("getCoords", parameters,
+                                 timeCall(compUtils.getCoords, repeats, lambda: (outputName, "coords.xyz"))))
+        results.append(summarise("gaussianChargeFinder", parameters,
+                                 timeCall(compUtils.gaussianChargeFinder, repeats, lambda: (outputName,))))
+        molecule = compUtils.moleculeBuilder(outputName)
+        molecule.charge, molecule.multiplicity = "0", "1"
+        for index, extension in [(0, ".gjf"), (orcaIndex, ".inp")]:
+            def fileSetup(index=index, extension=extension):
+                molecule.fullPath = "input" + extension
+                molecule.baseName = "input"
+                molecule.extensionType = extension
+                return molecule, index
+            results.append(summarise("genFile", dict(parameters, program=extension),
+                                     timeCall(compUtils.genFile, repeats, fileSetup)))
+            with open("input" + extension, "r") as inputFile:
+                firstFiveLines = [inputFile.readline() for line in range(5)]
+            results.append(summarise("slurmHandler", dict(parameters, program=extension),
+                                     timeCall(compUtils.slurmHandler, repeats,
+                                              lambda: (molecule, "input.cmd", "input.out", firstFiveLines))))
+        os.remove(outputName)
+
+    # Per-output costs, scaling with the size of the output rather than the molecule
+    for megabytes in outputSizes:
+        outputName = "size" + str(megabytes) + ".log"
+        gaussianOutput(outputName, 100, stepsForSize(100, megabytes))
+        parameters = {"megabytes": round(os.path.getsize(outputName) / 1024 / 1024, 1), "atoms": 100}
+        results.append(summarise("getCoords", parameters,
+                                 timeCall(compUtils.getCoords, repeats, lambda: (outputName, "coords.xyz"))))
+        if hasattr(compUtils, "outputScanner"):
+            results.append(summarise("outputScanner", parameters,
+                                     timeCall(compUtils.outputScanner, repeats, lambda: (outputName,))))
+        os.remove(outputName)
+
+    for structures in structureCounts:
+        goodVibesOutput("Goodvibes_output.dat", structures)
+        results.append(summarise("goodVibesProcessor", {"structures": structures},
+                                 timeCall(compUtils.goodVibesProcessor, repeats, lambda: ("Goodvibes_output.dat",))))
+
+    # One stalker cycle over finished Gaussian16 and ORCA jobs that squeue no longer knows about
+    jobSet = []
+    for job in range(stalkCount):
+        outputName = "stalk" + str(job) + ".out"
+        if job % 2 == 0:
+            gaussianOutput(outputName, 50, 10)
+        else:
+            orcaOutput(outputName, 50)
+        jobSet.append((str(9000000 + job), "stalk" + str(job), outputName))
+    frequency = 1 / 60 / 1000
+    results.append(summarise("jobStalking", {"jobs": stalkCount},
+                             timeCall(compUtils.jobStalking, repeats, lambda: (list(jobSet), 1, frequency))))
+    return results
+
+# Prints the median of every benchmark next to the one with the same name and parameters in an older results file
+def compareResults(results, previousFile):
+    with open(previousFile, "r") as inFile:
+        previous = json.load(inFile)
+    previousMedians = {(result["name"], json.dumps(result["parameters"], sort_keys=True)): result["median"]
+                       for result in previous["results"]}
+    print("\nCompared against " + previousFile + " (" + previous.get("revision", "unknown revision") + ")")
+    for result in results:
+        key = (result["name"], json.dumps(result["parameters"], sort_keys=True))
+        if key in previousMedians:
+            ratio = result["median"] / previousMedians[key] if previousMedians[key] > 0 else float("inf")
+            label = result["name"] + " " + " ".join(k + "=" + str(v) for k, v in result["parameters"].items())
+            print(label.ljust(60) + ("%.2fx" % ratio).rjust(14))
+
+def gitRevision(compUtilsPath):
+    try:
+        return subprocess.run(["git", "-C", os.path.dirname(compUtilsPath), "describe", "--always", "--dirty"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown revision"
+
+def main():
+    parser = argparse.ArgumentParser(description="Times CompUtils against synthetic outputs and a fake SLURM.")
+    parser.add_argument("-c", "--compUtils", type=str, default=defaultCompUtils, help="Path to compUtils.py.")
+    parser.add_argument("-a", "--atoms", type=str, default="10,100,1000,10000",
+                        help="Comma separated atom counts for the per-structure benchmarks.")
+    parser.add_argument("-s", "--sizes", type=str, default="1,64,512",
+                        help="Comma separated output sizes in MB for the per-output benchmarks.")
+    parser.add_argument("-l", "--large", action="store_true", help="Adds a 4 GB output to the output sizes.")
+    parser.add_argument("-g", "--goodvibes", type=str, default="100,10000",
+                        help="Comma separated structure counts for the GoodVibes benchmark.")
+    parser.add_argument("-j", "--jobs", type=int, default=200, help="Number of jobs in the stalker cycle.")
+    parser.add_argument("-n", "--repeats", type=int, default=5, help="Repeats of every benchmark.")
+    parser.add_argument("-o", "--output", type=str, help="Results file (Default: compUtilsBenchmark-DATE.json).")
+    parser.add_argument("--compare", type=str, help="Earlier results file to compare against.")
+    args = parser.parse_args()
+
+    compUtilsPath = os.path.abspath(args.compUtils)
+    outputFile = os.path.abspath(args.output or time.strftime("compUtilsBenchmark-%Y%m%d-%H%M%S.json"))
+    previousFile = os.path.abspath(args.compare) if args.compare else None
+    atomCounts = [int(count) for count in args.atoms.split(",")]
+    outputSizes = [int(size) for size in args.sizes.split(",")] + ([4096] if args.large else [])
+    structureCounts = [int(count) for count in args.goodvibes.split(",")]
+
+    originalDirectory = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="compUtilsBenchmark-")
+    try:
+        scratchEnvironment(scratch)
+        results = runBenchmarks(compUtilsPath, atomCounts, outputSizes, structureCounts, args.jobs, args.repeats)
+    finally:
+        os.chdir(originalDirectory)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {"revision": gitRevision(compUtilsPath), "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+              "host": socket.gethostname(), "python": platform.python_version(), "cpus": os.cpu_count(),
+              "repeats": args.repeats, "results": results}
+    with open(outputFile, "w") as outFile:
+        json.dump(report, outFile, indent=1)
+    print("\nResults written to " + outputFile)
+    if previousFile is not None:
+        compareResults(results, previousFile)
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,23 @@
 import os
 import argparse
 import glob
-#import sys
+import sys
 import time
 import subprocess
-
-from termcolor import cprint
-#import numpy # Will implement this eventually (probably)
-import pandas
-import regex
-from contextlib import closing
+import copy
+import sqlite3
+import json
+import zlib
+import select
+import struct
+import threading
+import fnmatch
+import functools
+import math
+
+# regex, numpy, asyncio, ctypes, termcolor, and pyarrow (only for Parquet) are imported where they are first used, so
+# that simple submissions and --help don't pay for loading them
+from contextlib import closing, contextmanager, nullcontext
 from mmap import mmap, ACCESS_READ
 
 # Set your defaults HERE
@@ -30,18 +38,60 @@ class Defaults:
     highMemoryRatio = 6
     memoryBuffer = 2
     wallTime = "24"
+    # Opt-in job sizing. Jobs get at least minimumCPU cores and enough to finish in about targetHours, their walltime
+    # padded by wallMargin, and more memory per core once they pass memoryBasis basis functions
+    minimumCPU = 2
+    targetHours = 4
+    wallMargin = 1.5
+    memoryBasis = 1000
+    # Memory SLURM hands out with every core where it can't be requested separately (None if it can), whether jobs
+    # are charged for the whole node anyway, and the most memory (GB) a job can ask one node for
+    coreMemory = None
+    wholeNode = False
+    nodeMemory = 192
+    # Method classes by route keyword, anything else is costed as DFT. Each class costs prefactor * basis functions **
+    # exponent CPU seconds until --calibrate fits it to finished outputs
+    methodClasses = {"coupledCluster": ["CCSD", "DLPNO", "QCISD"], "doubleHybrid": ["B2PLYP", "DSD-", "PWPB95", "MP2"]}
+    sizingModels = {"dft": [1e-4, 3.0], "doubleHybrid": [2e-6, 4.0], "coupledCluster": [5e-3, 2.5]}
+    # Basis functions per heavy atom and per hydrogen by zeta level, scaled up for diffuse functions
+    basisFunctionsPerAtom = {2: (15, 5), 3: (26, 8), 4: (55, 30)}
+    diffuseFactor = 1.3
+    calibrationMinimum = 3
+    # Walltimes are predicted from how long each method has taken before, as CPU seconds = prefactor * atoms **
+    # exponent, padded by wallMargin or by wallSigmas standard deviations of the fit if that is more. Requests are
+    # rounded up to the next step so similar jobs still batch together
+    wallTimePrediction = True
+    timingExponent = 3.0
+    wallSigmas = 2
+    wallTimeSteps = [1, 2, 4, 8, 12, 24]
+    # Jobs that hit their walltime count as having needed this much longer
+    timeoutFactor = 2
+    # SLURM states of jobs that will never have a usable timing, and how many job IDs go to sacct at once
+    failedStates = ["FAILED", "CANCELLED", "OUT_OF_MEMORY", "NODE_FAIL", "PREEMPTED", "BOOT_FAIL", "DEADLINE",
+                    "ERROR TERMINATION", "UNKNOWN"]
+    accountingChunk = 500
+    # Pack mode splits the Defaults CPU count into packLanes lanes, each running its jobs back to back, and fills each
+    # pack until a lane would run past packHours. Jobs in a pack are registered as PACKID:N
+    packLanes = 4
+    packHours = 4
+    packSeparator = ":"
+    packExtension = ".sh"
     cluster = "smp"
     partition = "pliu"
     # Filemask and Extension related
     singlePointExtra = "_SP"
     reRunExtra = "_re"
     coordExtension = ".xyz"
+    trajectoryExtra = "_traj"
+    orientationHeader = b"                         Standard orientation:                         "
     gaussianExtension = ".gjf"
     orcaExtension = ".inp"
     qChemExtension = ".in"
     cubeExtension = ".cube"
     queueExtension = ".cmd"
     outputExtension = ".out"
+    manifestExtension = ".manifest"
+    logExtension = ".log"
     # Single point calculation related
     method = "M062X"
     methodLine = "M062X 6-311+G(d,p)"
@@ -56,9 +106,54 @@ class Defaults:
     denCube = "Den"
     valenceCube = "Val"
     spinCube = "Spin"
+    cubeKeywords = {potCube: "Potential=SCF", denCube: "Density=SCF", valenceCube: "MO=Valence", spinCube: "Spin=SCF"}
+    # Cube jobs are named after the molecule with this appended
+    cubeJobExtra = "Cubes"
+    # Cube grids are cached next to the cube, parsed this many bytes at a time, and written this many rows at a time
+    cubeCacheExtension = ".npy"
+    cubeChunkSize = 64 * 1024 * 1024
+    cubeWriteRows = 4096
+    cubeValueFormat = "%13.5E"
+    cubeDifferenceExtra = "_diff"
+    # GoodVibes exports, named with the format as the extension, and written to Parquet this many rows at a time
+    goodVibesOutput = "GoodVibes"
+    parquetBatchRows = 65536
+    energiesOutput = "Energies"
+    benchMatrixOutput = "BenchMatrix"
+    benchSummaryOutput = "BenchSummary"
+    benchReference = "DLPNO-CCSD(T)"
+    hartreeToKcal = 627.5094740631
+    bohrToAngstrom = 0.529177210903
     # Job stalking related
     stalkDuration = 120
     stalkFrequency = 5
+    # Watch mode pings the queue less often, since outputs are checked every watchPoll seconds in between
+    watchFrequency = 15
+    watchPoll = 10
+    # The daemon gives up after a week, and --attach replays this many lines of its log
+    daemonDuration = 10080
+    daemonPidFile = os.path.join(binDirectory, "stalker.pid")
+    daemonLogFile = os.path.join(binDirectory, "stalker.log")
+    attachLines = 40
+    # Local commands (formchk, cubegen) run at most this many at a time, in the environment of these modules
+    commandWorkers = 8
+    gaussianModules = ["gaussian"]
+    # How much of the --profile breakdown to print
+    profileMolecules = 20
+    profileFunctions = 15
+    # IN_MODIFY | IN_CLOSE_WRITE | IN_CREATE | IN_MOVED_TO
+    inotifyMask = 0x002 | 0x008 | 0x100 | 0x080
+    # Parse cache, shared by every working directory
+    cacheFile = os.path.join(binDirectory, "compUtils.cache")
+    # Registry of every job CompUtils submits, by SLURM job ID
+    registryFile = os.path.join(binDirectory, "compUtils.registry")
+    # benchmarking.txt, programs.txt, and hpc.type compiled together, rebuilt whenever one of them changes
+    configFile = os.path.join(binDirectory, "compUtils.config")
+    # Sizing models fitted by --calibrate
+    sizingFile = os.path.join(binDirectory, "compUtils.sizing")
+    programExtensions = {"G16": gaussianExtension, "O": orcaExtension, "Q": qChemExtension}
+    statusColors = {"SUBMITTED": "light_blue", "PENDING": "light_yellow", "RUNNING": "light_magenta",
+                    "NORMAL TERMINATION": "light_green", "COMPLETED": "light_green"}
     # Job submission related. Edit this across clusters
     gaussianNonVariant = ["\nmodule purge\nmodule load gaussian\n\n",
                           "export GAUSS_SCRDIR=$SLURM_SCRATCH\nulimit -s unlimited\nexport LC_COLLATE=C\n"]
@@ -73,6 +168,7 @@ class Defaults:
     ramLineVariants = ["%mem","%maxcore"]
     terminationVariants = ["normal termination","terminated normally","error termination"]
     submissionList = []
+    arrayLine = "#SBATCH --array=1-"
     hpcType = "H2P"
 
 class Stampede3Submission:
@@ -99,126 +195,389 @@ fullPaths = []
 totalJobList = []
 totalOutputs = []
 isStalking = False
+isWatching = False
+isDaemon = False
+isLocal = False
+isBatch = False
 isCheck = False
 isNBO = False
+isAutoSize = False
+isPack = False
 isCustomTarget = True
 canBench = True
 indexOverride = 0
+# Sizing models in use, loaded from the calibration the first time a job is sized
+sizingModels = None
+# Walltime models by method, fitted from the job registry the first time a walltime is predicted
+timingModels = None
+workerCount = 1
 methodLine = []
 fullMethodLine = []
+# Per benchmarking.txt line, whether it solvates with SMD and whether it needs mixedbasis.txt
+smdLines = []
+mixedBasisLines = []
 fileExtension = ""
-# Paired together for program identification
-methodList = []
-targetProgram = []
+# Method to program (G16, O, Q) for program identification
+methodPrograms = {}
 stalkingSet = set()
+# Parse cache connections, keyed by the process and thread that opened them
+parseCache = {}
+# Environments captured after module loads, keyed by the tuple of modules
+moduleEnvironments = {}
+# Job registry connections, keyed the same way
+jobRegistry = {}
+registryColumns = [("jobId", "TEXT PRIMARY KEY"), ("jobName", "TEXT"), ("outputPath", "TEXT"), ("directory", "TEXT"),
+                   ("submitTime", "REAL"), ("molecule", "TEXT"), ("methodIndex", "INTEGER"), ("program", "TEXT"),
+                   ("cpus", "INTEGER"), ("ram", "INTEGER"), ("wallTime", "TEXT"), ("startTime", "REAL"),
+                   ("endTime", "REAL"), ("status", "TEXT"), ("method", "TEXT"), ("atoms", "INTEGER"),
+                   ("elapsed", "REAL")]
+# Batch submissions grouped by (extension, CPUs, RAM, walltime)
+batchGroups = {}
+# Jobs waiting to be packed, as (baseName, rootName, methodIndex, atoms, extension, cpus, ram, hours)
+packQueue = []
+# Timing spans for --profile. Stays None unless the flag is given, so a span costs a single check otherwise
+profiler = None
+noSpan = nullcontext()
 # Useful for user input processing
 booleanStrings = ["y","n"]
 
 # NEW!! Attempting to keep track of everything related to a job in one central location
-# This allows for file name, extension, charge, multiplicity, and coordinate list to be edited and stored on a per-complex basis
+# This allows for file name, extension, charge, multiplicity, and coordinates to be edited and stored on a per-complex basis
+# Slotted, with the geometry held as an int8 array of atomic numbers and a contiguous (atoms x 3) float64 array, so
+# thousands of molecules in flight cost a few arrays each rather than a dict and one string per atom
 class Molecule:
-    def __init__(self, fullPath, baseName, charge, multiplicity, coordinateList, extensionType, rootName):
+    __slots__ = ("fullPath", "baseName", "charge", "multiplicity", "atomicNumbers", "coordinates", "extensionType",
+                 "rootName", "methodIndex", "route", "convergeCount", "hasStability", "isStable", "termination",
+                 "scfEnergies", "wallTime")
+
+    def __init__(self, fullPath, baseName, charge, multiplicity, atomicNumbers, coordinates, extensionType, rootName):
         self.fullPath = fullPath
         self.baseName = baseName
         self.charge = charge
         self.multiplicity = multiplicity
-        self.coordinateList = coordinateList
+        self.atomicNumbers = atomicNumbers
+        self.coordinates = coordinates
         self.extensionType = extensionType
         self.rootName = rootName
+        # Line of benchmarking.txt the job was generated from, if any
+        self.methodIndex = None
+        # Walltime in hours picked for the job by the sizing model, Defaults.wallTime if not sized
+        self.wallTime = None
+        # Filled in from the single-pass output scanner where a job starts from a Gaussian16 output
+        self.route = ""
+        self.convergeCount = None
+        self.hasStability = False
+        self.isStable = False
+        self.termination = ""
+        self.scfEnergies = []
+
+# Everything the single-pass scanner pulls out of a Gaussian16 output. Offsets are kept instead of decoded blocks so
+# that memory use doesn't grow with the length of the output
+class OutputScan:
+    def __init__(self):
+        self.charge = None
+        self.multiplicity = None
+        self.route = ""
+        self.orientationOffset = None
+        self.orientationCount = 0
+        self.convergeCount = None
+        self.convergeCycles = 0
+        self.hasStability = False
+        self.isStable = False
+        self.termination = ""
+        self.scfEnergies = []
+        # Where the next scan of a growing output picks up
+        self.offset = 0
+
+# Every marker the scanner reacts to as one alternation, so a single regex pass over the mmap finds all of them.
+# Compiled the first time an output is scanned, since submissions that never scan one shouldn't pay for it
+@functools.cache
+def outputPatterns():
+    import regex
+    return regex.compile(
+        rb"(?P<charge>Charge =[^0-9\n-]*(?P<chargeValue>-?\d+) Multiplicity =[^0-9\n]*(?P<multiplicityValue>\d+))"
+        rb"|(?P<orientation>Standard orientation:)"
+        rb"|(?P<route>Will use up to)"
+        rb"|(?P<table>Item +Value +Threshold +Converged\?)"
+        rb"|(?P<stability>Stability analysis)"
+        rb"|(?P<stable>The wavefunction is already stable\.)"
+        rb"|(?P<scf>SCF Done: +E\([^)]*\) = +(?P<scfValue>-?\d+\.\d+))"
+        rb"|(?P<nextStep>Proceeding to internal job step)"
+        rb"|(?P<termination>(?i:" + "|".join(Defaults.terminationVariants).encode() + rb"))")
+
+# Everything energyScanner looks for in Gaussian16 and ORCA outputs, as one alternation dispatched on the group name
+@functools.cache
+def energyPatterns():
+    import regex
+    return regex.compile(
+        rb"(?P<scf>SCF Done: +E\([^)]*\) = +(?P<scfValue>-?\d+\.\d+))"
+        rb"|(?P<doubleHybrid>E2\([^)]*\) = +\S+ +E\([^)]*\) = +(?P<doubleHybridValue>-?\d*\.\d+(?:D[+-]\d+)?))"
+        rb"|(?P<mp2>EUMP2 = +(?P<mp2Value>-?\d*\.\d+(?:D[+-]\d+)?))"
+        rb"|(?P<orcaFinal>FINAL SINGLE POINT ENERGY +(?P<orcaFinalValue>-?\d+\.\d+))"
+        rb"|(?P<ccsdt>E\(CCSD\(T\)\) +\.\.\. +(?P<ccsdtValue>-?\d+\.\d+))"
+        rb"|(?P<zpe>Zero-point correction= +(?P<zpeValue>-?\d+\.\d+))"
+        rb"|(?P<thermalEnergy>Thermal correction to Energy= +(?P<thermalEnergyValue>-?\d+\.\d+))"
+        rb"|(?P<thermalEnthalpy>Thermal correction to Enthalpy= +(?P<thermalEnthalpyValue>-?\d+\.\d+))"
+        rb"|(?P<thermalGibbs>Thermal correction to Gibbs Free Energy= +(?P<thermalGibbsValue>-?\d+\.\d+))"
+        rb"|(?P<orcaZpe>Zero point energy +\.\.\. +(?P<orcaZpeValue>-?\d+\.\d+) Eh)"
+        rb"|(?P<orcaThermal>Total thermal correction +(?P<orcaThermalValue>-?\d+\.\d+) Eh)"
+        rb"|(?P<orcaEnthalpy>Thermal Enthalpy correction +\.\.\. +(?P<orcaEnthalpyValue>-?\d+\.\d+) Eh)"
+        rb"|(?P<orcaGibbs>G-E\(el\) +\.\.\. +(?P<orcaGibbsValue>-?\d+\.\d+) Eh)"
+        rb"|(?P<frequencyHeader>Harmonic frequencies)"
+        rb"|(?P<frequencies>Frequencies -- +(?P<frequenciesValue>[-\d. ]+))"
+        rb"|(?P<orcaFrequencyHeader>VIBRATIONAL FREQUENCIES)"
+        rb"|(?P<orcaFrequency>\d+: +(?P<orcaFrequencyValue>-?\d+\.\d+) cm\*\*-1)"
+        rb"|(?P<cpuTime>Job cpu time: +(?P<cpuTimeValue>\d+ +days +\d+ +hours +\d+ +minutes +[\d.]+ +seconds))"
+        rb"|(?P<wallTime>Elapsed time: +(?P<wallTimeValue>\d+ +days +\d+ +hours +\d+ +minutes +[\d.]+ +seconds))"
+        rb"|(?P<orcaWallTime>TOTAL RUN TIME: +"
+        rb"(?P<orcaWallTimeValue>\d+ days \d+ hours \d+ minutes \d+ seconds \d+ msec))"
+        rb"|(?P<orcaProcesses>%pal nprocs +(?P<orcaProcessesValue>\d+))"
+        rb"|(?P<processors>Will use up to +(?P<processorsValue>\d+) processors)"
+        rb"|(?P<basis>(?P<basisValue>\d+) basis functions,)"
+        rb"|(?P<orcaBasis>Number of basis functions +\.\.\. +(?P<orcaBasisValue>\d+))"
+        rb"|(?P<route>\n #(?P<routeValue>[^\n]*))"
+        rb"|(?P<orcaRoute>\|\s*\d+>\s*!(?P<orcaRouteValue>[^\n]*))"
+        rb"|(?P<termination>(?i:" + "|".join(Defaults.terminationVariants).encode() + rb"))")
+
+# termcolor is only loaded the first time something is printed in colour
+def cprint(*args, **kwargs):
+    from termcolor import cprint as colorPrint
+    colorPrint(*args, **kwargs)
+
+# Collects the --profile breakdown: wall time per stage, per molecule, and optionally a cProfile of the whole run.
+# Spans can be recorded from the stalker's threads, so records are locked. Worker processes (--workers) keep their
+# own spans, so parse and generate are only timed as a whole there
+class StageProfiler:
+    def __init__(self, profileFile=""):
+        self.startTime = time.perf_counter()
+        # stage -> [seconds, count], and molecule -> {stage: seconds}
+        self.stageTimes = {}
+        self.moleculeTimes = {}
+        self.lock = threading.Lock()
+        self.profileFile = profileFile
+        self.cProfiler = None
+        if len(profileFile) != 0:
+            import cProfile
+            self.cProfiler = cProfile.Profile()
+            self.cProfiler.enable()
+
+    def record(self, stage, name, seconds):
+        with self.lock:
+            stageTotal = self.stageTimes.setdefault(stage, [0.0, 0])
+            stageTotal[0] += seconds
+            stageTotal[1] += 1
+            if name is not None:
+                moleculeTotal = self.moleculeTimes.setdefault(name, {})
+                moleculeTotal[stage] = moleculeTotal.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def span(self, stage, name=None):
+        spanStart = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, name, time.perf_counter() - spanStart)
+
+    def report(self):
+        wallTime = time.perf_counter() - self.startTime
+        cprint("\nProfile of this run (" + str(round(wallTime, 3)) + " seconds wall time)", "light_cyan")
+        print("Stage".ljust(20) + "Total (s)".rjust(12) + "Calls".rjust(8) + "Mean (ms)".rjust(12) + "Wall %".rjust(9))
+        for stage, (seconds, count) in sorted(self.stageTimes.items(), key=lambda item: -item[1][0]):
+            print(stage.ljust(20) + ("%.4f" % seconds).rjust(12) + str(count).rjust(8)
+                  + ("%.2f" % (seconds / count * 1000)).rjust(12) + ("%.1f" % (seconds / wallTime * 100)).rjust(9))
+
+        if len(self.moleculeTimes) != 0:
+            stages = [stage for stage in self.stageTimes if any(stage in times for times in self.moleculeTimes.values())]
+            slowest = sorted(self.moleculeTimes.items(), key=lambda item: -sum(item[1].values()))
+            cprint("\nSlowest molecules (" + str(min(len(slowest), Defaults.profileMolecules)) + " of "
+                   + str(len(slowest)) + ", seconds)", "light_cyan")
+            print("Molecule".ljust(32) + "".join(stage.rjust(14) for stage in stages) + "Total".rjust(12))
+            for name, times in slowest[:Defaults.profileMolecules]:
+                print(name[:31].ljust(32) + "".join(("%.4f" % times.get(stage, 0.0)).rjust(14) for stage in stages)
+                      + ("%.4f" % sum(times.values())).rjust(12))
+
+        if self.cProfiler is not None:
+            import pstats
+            self.cProfiler.disable()
+            self.cProfiler.dump_stats(self.profileFile)
+            cprint("\ncProfile written to " + self.profileFile + ". Top functions by cumulative time:", "light_cyan")
+            pstats.Stats(self.cProfiler).sort_stats("cumulative").print_stats(Defaults.profileFunctions)
+
+# Times a block under a stage, attributed to a molecule if named. A shared no-op when --profile is off
+def profileSpan(stage, name=None):
+    if profiler is None:
+        return noSpan
+    return profiler.span(stage, name)
+
+# Times every call of a function under a stage, attributed to the molecule (or file) it was called on
+def profiled(stage):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if profiler is None:
+                return function(*args, **kwargs)
+            if isinstance(args[0], Molecule):
+                name = args[0].rootName
+            else:
+                name = os.path.basename(str(args[0])).split(".")[0]
+            with profiler.span(stage, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Whether a route line solvates with SMD, and whether it needs mixedbasis.txt
+def routeFlags(route):
+    import regex
+    isSMD = regex.search("smd", route, regex.IGNORECASE) is not None
+    isMixedBasis = any(keyWord in Defaults.mixedBasisVariants for keyWord in route.split())
+    return isSMD, isMixedBasis
+
+# Reads benchmarking.txt, programs.txt, and hpc.type into one validated dictionary. Blank lines are skipped, and
+# programs.txt lines that don't name a method and a known program are reported and ignored
+def compileConfiguration(sourcePaths):
+    config = {"canBench": True, "isCustomTarget": True, "fullMethodLine": [], "methodLine": [], "smdLines": [],
+              "mixedBasisLines": [], "methodPrograms": {}, "hpcType": None}
+
+    if os.path.isfile(sourcePaths["benchmarking"]):
+        with open(sourcePaths["benchmarking"], "r") as methodFile:
+            for line in methodFile:
+                if len(line.split()) == 0:
+                    continue
+                config["fullMethodLine"].append(line)
+                config["methodLine"].append(line.split()[0])
+    else:
+        config["canBench"] = False
+        config["fullMethodLine"] = [Defaults.methodLine]
+        config["methodLine"] = [Defaults.method]
+    for line in config["fullMethodLine"]:
+        isSMD, isMixedBasis = routeFlags(line)
+        config["smdLines"].append(isSMD)
+        config["mixedBasisLines"].append(isMixedBasis)
+
+    if os.path.isfile(sourcePaths["programs"]):
+        with open(sourcePaths["programs"], 'r') as programFile:
+            for targetLine in programFile:
+                currentSubs = targetLine.split()
+                if len(currentSubs) == 0:
+                    continue
+                if len(currentSubs) < 2 or currentSubs[1] not in Defaults.programExtensions:
+                    cprint("Notice: Ignoring programs.txt line '" + targetLine.strip() + "', which needs a method and "
+                           "one of " + ", ".join(Defaults.programExtensions) + ".", "light_red")
+                    continue
+                config["methodPrograms"][currentSubs[0]] = currentSubs[1]
+    else:
+        config["isCustomTarget"] = False
+        config["methodPrograms"] = dict(zip(Defaults.methodNames, Defaults.targetProgram))
+
+    if os.path.isfile(sourcePaths["hpc"]):
+        with open(sourcePaths["hpc"], "r") as hpcFile:
+            config["hpcType"] = hpcFile.readline().strip()
+    return config
+
+# Loads the compiled configuration, recompiling it only when a source file has been modified, created, or deleted
+# since it was cached. Runs after the command line is parsed, so --help never touches ~/bin
+def loadConfiguration():
+    global canBench, isCustomTarget, fullMethodLine, methodLine, smdLines, mixedBasisLines, methodPrograms
+
+    sourcePaths = {"benchmarking": os.path.join(Defaults.binDirectory, "benchmarking.txt"),
+                   "programs": os.path.join(Defaults.binDirectory, "programs.txt"),
+                   "hpc": os.path.join(Defaults.binDirectory, "hpc.type")}
+    sourceStamps = {}
+    for source, path in sourcePaths.items():
+        try:
+            fileStats = os.stat(path)
+            sourceStamps[source] = [fileStats.st_mtime_ns, fileStats.st_size]
+        except FileNotFoundError:
+            sourceStamps[source] = None
+
+    config = None
+    try:
+        with open(Defaults.configFile, "r") as configFile:
+            cached = json.load(configFile)
+        if cached.get("sources") == sourceStamps:
+            config = cached["config"]
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    if config is None:
+        config = compileConfiguration(sourcePaths)
+        # The config only depends on ~/bin, so a failed write just means it's compiled again next time
+        try:
+            temporaryFile = Defaults.configFile + "." + str(os.getpid())
+            with open(temporaryFile, "w") as configFile:
+                json.dump({"sources": sourceStamps, "config": config}, configFile)
+            os.replace(temporaryFile, Defaults.configFile)
+        except OSError:
+            pass
 
-# Globally checks for benchmarking and programs data, limiting functionality and alerting user
-if os.path.isfile(os.path.join(Defaults.binDirectory, "benchmarking.txt")):
-    with open(os.path.join(Defaults.binDirectory, "benchmarking.txt"), "r") as methodFile:
-        for line in methodFile:
-            fullMethodLine.append(line)
-            methodLine.append(line.strip().split()[0])
-else:
-    canBench = False
-    fullMethodLine = Defaults.methodLine
-    methodLine = Defaults.method
-    cprint("Notice: Could not find benchmarking.txt in ~/bin/.", "light_red")
-    cprint("Benchmarking functionality is unavailable without requisite file. Please create your own or download "
-           "the template from GitHub.", "light_red")
-
-if os.path.isfile(os.path.join(Defaults.binDirectory, "programs.txt")):
-    with open(os.path.join(Defaults.binDirectory, "programs.txt"), 'r') as programFile:
-        for targetLine in programFile:
-            currentSubs = targetLine.strip().split(" ")
-            methodList.append(currentSubs[0])
-            targetProgram.append(currentSubs[1])
-else:
-    isCustomTarget = False
-    methodList = Defaults.methodNames
-    targetProgram = Defaults.targetProgram
-    cprint("Notice: Could not find programs.txt in ~/bin/.", "light_red")
-    cprint("Defaulting to hardcoded method targets.", "light_red")
+    canBench = config["canBench"]
+    isCustomTarget = config["isCustomTarget"]
+    fullMethodLine = config["fullMethodLine"]
+    methodLine = config["methodLine"]
+    smdLines = config["smdLines"]
+    mixedBasisLines = config["mixedBasisLines"]
+    methodPrograms = config["methodPrograms"]
+
+    # Globally checks for benchmarking and programs data, limiting functionality and alerting user
+    if not canBench:
+        cprint("Notice: Could not find benchmarking.txt in ~/bin/.", "light_red")
+        cprint("Benchmarking functionality is unavailable without requisite file. Please create your own or download "
+               "the template from GitHub.", "light_red")
+    if not isCustomTarget:
+        cprint("Notice: Could not find programs.txt in ~/bin/.", "light_red")
+        cprint("Defaulting to hardcoded method targets.", "light_red")
+    if config["hpcType"] is None:
+        firstTimeSetup()
+    else:
+        applyHpcType(config["hpcType"])
 
 def firstTimeSetup():
     systemType = str(input("Enter the name of the HPC cluster you are using (H2P, Expanse, Bridges2, Stampede3) :"))
-    with open(os.path.join(Defaults.binDirectory, "hpc.type"), "w") as hpcFile:
-        match systemType:
-            case "H2P":
-                hpcFile.write("H2P")
-                Defaults.hpcType = "H2P"
-                Defaults.submissionList = H2PSubmission.submissionList
-            case "Bridges2":
-                hpcFile.write("Bridges2")
-                Defaults.hpcType = "Bridges2"
-                Defaults.submissionList = Bridges2Submission.submissionList
-                Defaults.hpcType = "Bridges2"
-                Defaults.partition = "RM-shared"
-                Defaults.memoryRatio = 2
-                Defaults.memoryBuffer = 0
-                Defaults.highMemoryRatio = 2
-            case "Expanse":
-                print("CompUtils is not supported on the Expanse architecture due to being outdated and messy. Have a good day.")
-            case "Stampede3":
-                hpcFile.write("Stampede3")
-                Defaults.hpcType = "Stampede3"
-                Defaults.partition = "icx"
-                Defaults.CPU = 80
-                Defaults.memoryRatio = 200/80
-                Defaults.memoryBuffer = 0
-                Defaults.highMemoryRatio = 200/80
-                Defaults.submissionList = Stampede3Submission.submissionList
-            case _:
-                cprint("Unknown HPC architecture input. Aborting.", "light_red")
-                return
-
-if os.path.isfile(os.path.join(Defaults.binDirectory, "hpc.type")):
-    with open(os.path.join(Defaults.binDirectory, "hpc.type"), "r") as hpcFile:
-        hpcLine = hpcFile.readline().strip()
-        match hpcLine:
-            case "H2P":
-                Defaults.hpcType = "H2P"
-                Defaults.submissionList = H2PSubmission.submissionList
-                Defaults.cluster = "smp"
-                Defaults.partition = "pliu"
-            case "Bridges2":
-                Defaults.hpcType = "Bridges2"
-                Defaults.partition = "RM-shared"
-                Defaults.memoryRatio = 2
-                Defaults.memoryBuffer = 0
-                Defaults.highMemoryRatio = 2
-                Defaults.submissionList = Bridges2Submission.submissionList
-            case "Stampede3":
-                Defaults.hpcType = "Stampede3"
-                Defaults.partition = "icx"
-                Defaults.CPU = 80
-                Defaults.memoryRatio = 200/80
-                Defaults.memoryBuffer = 0
-                Defaults.highMemoryRatio = 200/80
-                Defaults.submissionList = Stampede3Submission.submissionList
-            case "Expanse":
-                print("CompUtils is NOT supported on Expanse. Have a good day.")
-            case _:
-                cprint("Unknown HPC architecture input. Aborting.", "light_red")
-else:
-    firstTimeSetup()
+    match systemType:
+        case "H2P" | "Bridges2" | "Stampede3":
+            with open(os.path.join(Defaults.binDirectory, "hpc.type"), "w") as hpcFile:
+                hpcFile.write(systemType)
+            applyHpcType(systemType)
+        case "Expanse":
+            print("CompUtils is not supported on the Expanse architecture due to being outdated and messy. Have a good day.")
+        case _:
+            cprint("Unknown HPC architecture input. Aborting.", "light_red")
+
+# Sets the partition, memory ratios, and submission script for the cluster named in hpc.type
+def applyHpcType(hpcLine):
+    match hpcLine:
+        case "H2P":
+            Defaults.hpcType = "H2P"
+            Defaults.submissionList = H2PSubmission.submissionList
+            Defaults.cluster = "smp"
+            Defaults.partition = "pliu"
+        case "Bridges2":
+            Defaults.hpcType = "Bridges2"
+            Defaults.partition = "RM-shared"
+            Defaults.memoryRatio = 2
+            Defaults.memoryBuffer = 0
+            Defaults.highMemoryRatio = 2
+            Defaults.coreMemory = 2
+            Defaults.nodeMemory = 256
+            Defaults.submissionList = Bridges2Submission.submissionList
+        case "Stampede3":
+            Defaults.hpcType = "Stampede3"
+            Defaults.partition = "icx"
+            Defaults.CPU = 80
+            Defaults.memoryRatio = 200/80
+            Defaults.memoryBuffer = 0
+            Defaults.highMemoryRatio = 200/80
+            Defaults.wholeNode = True
+            Defaults.nodeMemory = 200
+            Defaults.submissionList = Stampede3Submission.submissionList
+        case "Expanse":
+            print("CompUtils is NOT supported on Expanse. Have a good day.")
+        case _:
+            cprint("Unknown HPC architecture input. Aborting.", "light_red")
 
 # Defines all the terminal flags the program can accept
 def commandLineParser():
-    global isStalking, isCheck, isNBO, indexOverride
+    global isStalking, isWatching, isDaemon, isLocal, isBatch, isCheck, isNBO, isAutoSize, isPack, indexOverride
+    global workerCount, profiler
 
     parser = argparse.ArgumentParser(description="The main command line argument parser for flag handling")
 
@@ -232,9 +591,24 @@ def commandLineParser():
                                                                          "for the job creation subroutines.")
     parser.add_argument('-cu','--cube', type=str, help="Indicates the gimmeCubes functionality on a given "
                                                        "Gaussian16 checkpoint file.")
+    parser.add_argument('-lo','--local', action='store_true', help="Generates cubes on this node instead of submitting"
+                                                                   " cube jobs.")
     parser.add_argument('-st','--stalk', action='store_true', help="Activates job stalking.")
+    parser.add_argument('-dm','--daemon', action='store_true', help="Runs job stalking as a detached daemon that"
+                                                                    " follows every unfinished job in the registry.")
+    parser.add_argument('-at','--attach', action='store_true', help="Follows the log of the stalking daemon.")
+    parser.add_argument('-wa','--watch', action='store_true', help="Activates job stalking in watch mode, reporting"
+                                                                   " terminations as soon as they are written.")
     parser.add_argument('-ex', '--excel', type=str, help="Indicates the goodVibesToExcel functionality on a"
                                                          " given GoodVibes output file.")
+    parser.add_argument('-en', '--energies', type=str, help="Extracts energies from the listed Gaussian16 and ORCA"
+                                                            " outputs, joined to their single points, into one table.")
+    parser.add_argument('-bc', '--benchCollect', type=str, help="Collects the listed benchmark outputs into a"
+                                                                " structure by method matrix with errors and costs.")
+    parser.add_argument('-ref', '--reference', type=str, default=Defaults.benchReference,
+                        help="Reference method for the benchCollect flag (Default: DLPNO-CCSD(T)).")
+    parser.add_argument('-fmt', '--format', type=str, default="xlsx", choices=["xlsx", "csv", "parquet"],
+                        help="Output format for GoodVibes, energy, and benchmark exports (Default: xlsx).")
     parser.add_argument('-ovr', '--override', type=int, help="Indicates an integer override for indexing, used"
                                                              " for accessing single point methods that are not the first"
                                                              " line in a controlled manner. Keep in mind index counting "
@@ -244,17 +618,65 @@ def commandLineParser():
     parser.add_argument('-nbo','--nbo7',action='store_true',help="Enables NBO7 keylist addition for job creation subroutines.")
     parser.add_argument('-re','--rerun',type=str,help="Reruns a failed Gaussian16 job using the failed output"
                                                       " to generate the new input file.")
+    parser.add_argument('-w','--workers',type=int,help="Number of worker processes used to parse outputs and generate"
+                                                       " inputs for the single point and benchmark subroutines.")
+    parser.add_argument('-tr','--trajectory',type=str,help="Extracts every geometry of the listed Gaussian16 output(s)"
+                                                           " into a multi-frame XYZ file.")
+    parser.add_argument('-fr','--frame',type=int,help="Only extracts this frame with the trajectory flag, counting from"
+                                                      " 1. Negative frames count back from the end.")
+    parser.add_argument('-ev','--every',type=int,default=1,help="Only extracts every n-th frame with the trajectory"
+                                                                " flag.")
+    parser.add_argument('-ci','--cubeIntegrate',type=str,help="Integrates the listed cube file(s), per orbital for MO"
+                                                              " cubes.")
+    parser.add_argument('-cd','--cubeDifference',type=str,nargs='+',help="Writes the first cube minus every other"
+                                                                        " listed cube to FIRST_diff.cube.")
+    parser.add_argument('-sts','--status',type=str,nargs='?',const="*",help="Shows every job submitted from the"
+                                                 " current directory from the job registry, optionally only those"
+                                                 " matching a job name pattern.")
+    parser.add_argument('-pf','--profile',type=str,nargs='?',const="",help="Prints how long each stage took per"
+                                                 " molecule at exit. A file name also saves a cProfile of the run"
+                                                 " there.")
+    parser.add_argument('-ba','--batch',action='store_true',help="Submits jobs sharing a program, CPU count, RAM, and"
+                                                                 " walltime together as SLURM job arrays.")
+    parser.add_argument('-as','--autoSize',action='store_true',help="Sizes the cores, memory, and walltime of generated"
+                                                                    " jobs from their atoms, basis set, and method.")
+    parser.add_argument('-pk','--pack',action='store_true',help="Packs short generated jobs together into shared"
+                                                               " SLURM jobs that run several at once.")
+    parser.add_argument('-cal','--calibrate',type=str,help="Fits the autoSize model to the timings of the listed"
+                                                           " finished outputs.")
 
     # Figures out what the hell you told it to do
     args = parser.parse_args()
+    if args.profile is not None:
+        profiler = StageProfiler(args.profile)
+    with profileSpan("configuration"):
+        loadConfiguration()
 
     # Flags that set bools come first
     if args.stalk:
         isStalking = True
+    if args.watch:
+        isStalking = True
+        isWatching = True
+    if args.daemon:
+        isStalking = True
+        isDaemon = True
     if args.checkpoint:
         isCheck = True
     if args.nbo7:
         isNBO = True
+    if args.batch:
+        isBatch = True
+    if args.local:
+        isLocal = True
+    if args.autoSize:
+        isAutoSize = True
+    if args.pack:
+        isPack = True
+        # Fitted before the workers fork, so they share it instead of each reading the registry
+        loadTimingModels()
+    if args.workers:
+        workerCount = args.workers
     if args.override:
         indexOverride = args.override
         cprint("Registered " + str(indexOverride) + " as the index override.", "light_cyan")
@@ -265,27 +687,17 @@ def commandLineParser():
         # Builds the molecule object per complex in input
         for job in jobList:
             baseName, extension = grabPaths(job)
-            newMolecule = Molecule(job, baseName, 0, 0, 0, extension, baseName)
+            newMolecule = Molecule(job, baseName, 0, 0, None, None, extension, baseName)
             runJob(newMolecule)
 
     if args.singlePoint:
         jobList = glob.glob(args.singlePoint)
-        for job in jobList:
-            baseName, extension = grabPaths(job)
-            charge, multiplicity = gaussianChargeFinder(job)
-            coordList = getCoords(job,baseName + Defaults.coordExtension)
-            newMolecule = Molecule(job, baseName, charge, multiplicity, coordList, extension, baseName)
-            genSinglePoint(newMolecule)
+        jobPipeline(jobList, genSinglePoint)
 
     if args.bench:
         if canBench:
             jobList = glob.glob(args.bench)
-            for job in jobList:
-                baseName, extension = grabPaths(job)
-                charge, multiplicity = gaussianChargeFinder(job)
-                coordList = getCoords(job,baseName + Defaults.coordExtension)
-                newMolecule = Molecule(job, baseName, charge, multiplicity, coordList, extension, baseName)
-                genBench(newMolecule)
+            jobPipeline(jobList, genBench)
         else:
             cprint("Notice: Benchmarking is unavailable without requisite file. Please create your own or download "
                 "the template from GitHub.", "light_red")
@@ -296,22 +708,46 @@ def commandLineParser():
             " Den Val Spin): "))
         jobList = glob.glob(args.cube)
         # This splits the entered keylist into separate keys, passed into gimmeCubes as an array which can be iterated through
-        cubeOptions = cubeList.split(" ")
+        cubeOptions = []
+        for cubeKey in cubeList.split():
+            if cubeKey in Defaults.cubeKeywords:
+                cubeOptions.append(cubeKey)
+            else:
+                cprint("Error: Unknown cube type " + cubeKey + ". Choose from " + " ".join(Defaults.cubeKeywords),
+                       "light_red")
+        moleculeList = []
         for job in jobList:
             baseName, extension = grabPaths(job)
-            newMolecule = Molecule(job, baseName, 0, 0, 0, extension, baseName)
-            if extension == ".chk":
-                formCheck(newMolecule)
-            gimmeCubes(newMolecule, cubeOptions)
+            moleculeList.append(Molecule(job, baseName, 0, 0, None, None, extension, baseName))
+        # Every checkpoint is formatted up front, in one environment, rather than one shell per file
+        formCheck([molecule for molecule in moleculeList if molecule.extensionType == ".chk"])
+        if len(cubeOptions) == 0 or len(moleculeList) == 0:
+            cprint("Nothing to generate cubes for.", "light_red")
+        elif isLocal:
+            localCubes(moleculeList, cubeOptions)
+        else:
+            gimmeCubes(moleculeList, cubeOptions)
 
     if args.goodvibes:
         cprint("Interactive GoodVibes interface activated. Please select your keylist from the common ones.", "light_cyan")
         totalKeyList = goodVibesInteractive()
-        os.system("goodvibes " + totalKeyList + " *.out")
+        runCommand(["goodvibes"] + totalKeyList.split() + sorted(glob.glob("*.out")), capture=False)
         cprint("GoodVibes has terminated. Handing output over to the excel exporter.", "light_cyan")
-        goodVibesProcessor("Goodvibes_output.dat")
+        goodVibesProcessor("Goodvibes_output.dat", args.format)
         cprint("Enjoy your Excel-formatted GoodVibes output!", "light_green")
 
+    if args.excel:
+        goodVibesProcessor(args.excel, args.format)
+
+    if args.energies:
+        extractEnergies(sorted(glob.glob(args.energies)), args.format)
+
+    if args.calibrate:
+        calibrateSizing(sorted(glob.glob(args.calibrate)))
+
+    if args.benchCollect:
+        benchCollect(sorted(glob.glob(args.benchCollect)), args.reference, args.format)
+
     if args.rerun:
         jobList = glob.glob(args.rerun)
         keylistOrder = str(input("Is your input structured as 'opt freq FUNCTIONAL' (y) or 'FUNCTIONAL other keys' (n)? :"))
@@ -320,12 +756,37 @@ def commandLineParser():
         else:
             skipIndex = 0
         for job in jobList:
-            baseName, extension = grabPaths(job)
-            charge, multiplicity = gaussianChargeFinder(job)
-            coordList = getCoords(job,baseName + "_failed" + Defaults.coordExtension)
-            newMolecule = Molecule(job, baseName, charge, multiplicity, coordList, extension, baseName)
+            newMolecule = moleculeBuilder(job, "_failed")
             genReRun(newMolecule,skipIndex)
 
+    if args.trajectory:
+        jobList = glob.glob(args.trajectory)
+        # Frames are counted from 1 on the command line, and from the end when negative, so there is no frame 0
+        if args.frame == 0:
+            cprint("Frames are counted from 1, or back from the end with -1 as the last. Aborting.", "light_red")
+        else:
+            if args.frame is not None and args.frame > 0:
+                args.frame -= 1
+            extractTrajectories(jobList, args.frame, max(args.every, 1))
+
+    if args.cubeIntegrate:
+        integrateCubes(sorted(glob.glob(args.cubeIntegrate)))
+
+    if args.cubeDifference:
+        differenceCubes(args.cubeDifference)
+
+    if args.status:
+        campaignStatus(args.status)
+
+    if args.attach:
+        attachDaemon()
+
+    # Everything collected by runJob in pack or batch mode goes out at the very end
+    if isPack:
+        submitPacks()
+    if isBatch:
+        submitBatches()
+
 # Finally handle filename creation in one place to stop the infinite copypasta
 def fileCreation(baseName, extensionType, extra):
     if not len(extra) == 0:
@@ -334,90 +795,766 @@ def fileCreation(baseName, extensionType, extra):
         fullFile = baseName + extensionType
     return fullFile
 
-# Formats checkpoints automatically
-def formCheck(molecule):
-    os.system("module purge")
-    os.system("module load gaussian")
-    os.system("formchk " + molecule.fullPath)
-    molecule.extensionType = ".fchk"
-    molecule.fullPath = molecule.rootName + molecule.extensionType
+# Loads modules once in a single login shell and keeps the environment it ends up with, so that every command run in
+# it afterwards sees the modules. Falls back on the current environment where there is no module system
+def moduleEnvironment(modules):
+    key = tuple(modules)
+    if key not in moduleEnvironments:
+        environment = dict(os.environ)
+        moduleScript = ("type module >/dev/null 2>&1 || exit 3; module purge >/dev/null 2>&1; "
+                        + "".join("module load " + module + " >/dev/null 2>&1; " for module in modules) + "env -0")
+        try:
+            shell = subprocess.run(["bash", "-lc", moduleScript], capture_output=True, timeout=120)
+            if shell.returncode == 0:
+                environment = dict(entry.split("=", 1) for entry in shell.stdout.decode(errors="replace").split("\0")
+                                   if "=" in entry)
+            else:
+                cprint("Notice: Could not load " + " ".join(modules) + ". Using the current environment.", "light_red")
+        except (OSError, subprocess.TimeoutExpired):
+            cprint("Notice: Could not load " + " ".join(modules) + ". Using the current environment.", "light_red")
+        moduleEnvironments[key] = environment
+    return moduleEnvironments[key]
+
+# Runs one command as an argument vector, without a shell. Output is captured unless the user should see it live.
+# Missing programs come back as exit code 127, like a shell would report them
+def runCommand(command, environment=None, capture=True):
+    try:
+        return subprocess.run(command, env=environment, capture_output=capture, text=True)
+    except OSError as error:
+        return subprocess.CompletedProcess(command, 127, "", str(error))
+
+# Runs a list of commands with at most commandWorkers at once, returning their results in order. Failures are
+# reported with whatever the command wrote to stderr
+def runCommands(commandList, environment=None, workers=None):
+    if workers is None:
+        workers = Defaults.commandWorkers
+    if len(commandList) <= 1 or workers <= 1:
+        results = [runCommand(command, environment) for command in commandList]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda command: runCommand(command, environment), commandList))
+    for result in results:
+        if result.returncode != 0:
+            cprint(" ".join(result.args) + " failed with exit code " + str(result.returncode) + ": "
+                   + (result.stderr or "").strip(), "light_red")
+    return results
+
+# Formats checkpoints automatically, all at once in a single Gaussian16 environment
+def formCheck(moleculeList):
+    # Nothing to convert means there is no reason to pay for a module environment
+    if len(moleculeList) == 0:
+        return
+    with profileSpan("formchk"):
+        environment = moduleEnvironment(Defaults.gaussianModules)
+        results = runCommands([["formchk", molecule.fullPath] for molecule in moleculeList], environment)
+    for molecule, result in zip(moleculeList, results):
+        if result.returncode == 0:
+            molecule.extensionType = ".fchk"
+            molecule.fullPath = molecule.rootName + molecule.extensionType
+
+# Atomic symbols indexed by atomic number, so a whole column of atomic numbers translates in one lookup. Index 0 is
+# the Gaussian16 ghost atom
+atomicSymbols = (
+    'Bq', 'H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne', 'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar', 'K',
+    'Ca', 'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn', 'Ga', 'Ge', 'As', 'Se', 'Br', 'Kr', 'Rb', 'Sr',
+    'Y', 'Zr', 'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd', 'In', 'Sn', 'Sb', 'Te', 'I', 'Xe', 'Cs', 'Ba', 'La',
+    'Ce', 'Pr', 'Nd', 'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy', 'Ho', 'Er', 'Tm', 'Yb', 'Lu', 'Hf', 'Ta', 'W', 'Re', 'Os',
+    'Ir', 'Pt', 'Au', 'Hg', 'Tl', 'Pb', 'Bi', 'Po', 'At', 'Rn', 'Fr', 'Ra', 'Ac', 'Th', 'Pa', 'U', 'Np', 'Pu', 'Am',
+    'Cm', 'Bk', 'Cf', 'Es', 'Fm', 'Md', 'No', 'Lr', 'Rf', 'Db', 'Sg', 'Bh', 'Hs', 'Mt', 'Ds', 'Rg', 'Cn', 'Nh', 'Fl',
+    'Mc', 'Lv', 'Ts', 'Og'
+)
+
+# Formats a whole geometry as element-symbol lines in a single format call, straight from the Molecule arrays
+def coordinateBlock(atomicNumbers, coordinates):
+    import numpy
+    if len(atomicNumbers) == 0:
+        return ""
+    lines = numpy.empty((len(atomicNumbers), 4), dtype=object)
+    lines[:, 0] = numpy.array(atomicSymbols)[atomicNumbers]
+    lines[:, 1:] = coordinates
+    return ("%-2s   %12.6f   %12.6f   %12.6f\n" * len(atomicNumbers)) % tuple(lines.ravel().tolist())
+
+# Decodes the Standard orientation block whose header starts at blockOffset in a mapped Gaussian16 output. Rows are
+# sliced straight out of the mmap and converted to atomic number and coordinate arrays in bulk rather than line by line
+def orientationBlock(data, blockOffset):
+    import numpy
+    pointer = data.find(b"\n", blockOffset)
+    # Skips the dashed lines and column headings, then takes every row up to the closing dashed line
+    for index in range(4):
+        pointer = data.find(b"\n", pointer + 1)
+    rowStart = pointer + 1
+    rowEnd = data.find(b" -----", rowStart)
+    if rowEnd == -1:
+        rowEnd = data.rfind(b"\n", rowStart) + 1
+    # Columns are center number, atomic number, atomic type, X, Y, Z
+    table = numpy.fromstring(data[rowStart:rowEnd].decode(), dtype=numpy.float64, sep=" ")
+    table = table[:len(table) - len(table) % 6].reshape(-1, 6)
+    return table[:, 1].astype(numpy.int8), numpy.ascontiguousarray(table[:, 3:])
 
 # A new fully pythonic solution to coordinate scraping, agnostic of the PERL bullshit on H2P
-def getCoords(fileName, outputFileName):
-    coordinateList = []
-    atSymbol = {
-        1: 'H', 2: 'He', 3: 'Li', 4: 'Be', 5: 'B', 6: 'C', 7: 'N', 8: 'O', 9: 'F', 10: 'Ne',
-        11: 'Na', 12: 'Mg', 13: 'Al', 14: 'Si', 15: 'P', 16: 'S', 17: 'Cl', 18: 'Ar', 19: 'K',
-        20: 'Ca', 21: 'Sc', 22: 'Ti', 23: 'V', 24: 'Cr', 25: 'Mn', 26: 'Fe', 27: 'Co', 28: 'Ni',
-        29: 'Cu', 30: 'Zn', 31: 'Ga', 32: 'Ge', 33: 'As', 34: 'Se', 35: 'Br', 36: 'Kr',
-
-        42: 'Mo', 44: 'Ru', 45: 'Rh', 46: 'Pd', 47: 'Ag', 48: 'Cd', 50: 'Sn', 51: 'Sb',
-        53: 'I', 54: 'Xe', 77: 'Ir', 78: 'Pt', 79: 'Au', 80: 'Hg', 81: 'Tl', 82: 'Pb',
-        83: 'Bi'
-    }
-
-    # Initialize local empty lists
-    at = []
-    X = []
-    Y = []
-    Z = []
-
-    with open(fileName, 'r+') as inFile, open(outputFileName, 'w') as outputFile:
+# The block offset from outputScanner skips the reverse search for the final Standard orientation entirely
+def getCoords(fileName, outputFileName, blockOffset=None):
+    import regex
+    with open(fileName, 'r+') as inFile:
         # Maps the file into memory for reading byte-wise, without any read buffer. AFAIK this is the most memory efficient
         # way to be able to read files of any size
         with closing(mmap(inFile.fileno(), 0, access=ACCESS_READ)) as data:
-            tableHeader = "                         Standard orientation:                         "
-            tableBytes = tableHeader.encode()
-            finalTableHeader = regex.search(tableBytes, data, regex.REVERSE)
-            # Finds where the header ends, sets that as the pointer, and reads ahead two bytes to skip over the newline character
-            pointer = finalTableHeader.ends()
-            data.seek(pointer[0])
-            data.read(2)
-            for index in range(4):
-                data.readline()
-            line = data.readline().decode().strip()
-            while len(line.split()) > 2:
-                # Extracts the Atomic Number, and X Y Z coordinates into their respective lists
-                at.append(str(line.split()[1]))
-                X.append(str(line.split()[3]))
-                Y.append(str(line.split()[4]))
-                Z.append(str(line.split()[5]))
-                line = data.readline().decode().strip()
+            if blockOffset is None:
+                blockOffset = regex.search(Defaults.orientationHeader, data, regex.REVERSE).start()
+            atomicNumbers, coordinates = orientationBlock(data, blockOffset)
+
+    with open(outputFileName, 'w') as outputFile:
+        outputFile.write(str(len(atomicNumbers)) + "\nPointless Comment Line\n" +
+                         coordinateBlock(atomicNumbers, coordinates))
+    return atomicNumbers, coordinates
+
+# Every geometry of an optimization, IRC, or scan, read lazily. Opening one only records where each Standard orientation
+# block starts, and a frame is decoded from the map when it is asked for, so memory stays flat however long the
+# output is. Frames index like a list: trajectory[-1] is the last geometry, trajectory[::5] every fifth
+class Trajectory:
+    def __init__(self, fileName):
+        import numpy
+        self.fileName = fileName
+        self.inFile = open(fileName, 'rb')
+        self.data = mmap(self.inFile.fileno(), 0, access=ACCESS_READ)
+        offsets = []
+        pointer = self.data.find(Defaults.orientationHeader)
+        while pointer != -1:
+            offsets.append(pointer)
+            pointer = self.data.find(Defaults.orientationHeader, pointer + 1)
+        self.offsets = numpy.array(offsets, dtype=numpy.int64)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # Returns (atomicNumbers, coordinates) for one frame, or a generator of them for a slice
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return (orientationBlock(self.data, offset) for offset in self.offsets[index])
+        return orientationBlock(self.data, self.offsets[index])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.data.close()
+        self.inFile.close()
+
+    # Streams the chosen frames into one multi-frame XYZ file, decoding a single frame at a time
+    def exportXYZ(self, outputFileName, frames=slice(None)):
+        frameNumbers = range(len(self))[frames]
+        with open(outputFileName, 'w') as outputFile:
+            for frameNumber in frameNumbers:
+                atomicNumbers, coordinates = self[frameNumber]
+                outputFile.write(str(len(atomicNumbers)) + "\nFrame " + str(frameNumber + 1) + " of " +
+                                 str(len(self)) + "\n" + coordinateBlock(atomicNumbers, coordinates))
+        return len(frameNumbers)
+
+# Pulls trajectories out of each Gaussian16 output, either every step (thinned with every) or a single frame
+def extractTrajectories(jobList, frame=None, every=1):
+    for job in jobList:
+        baseName, extension = grabPaths(job)
+        # A job that has only just started has nothing to map yet
+        if os.path.getsize(job) == 0:
+            cprint(job + " is empty.", "light_red")
+            continue
+        with Trajectory(job) as trajectory:
+            if len(trajectory) == 0:
+                cprint("No geometries found in " + job + ".", "light_red")
+                continue
+            if frame is not None:
+                if not -len(trajectory) <= frame < len(trajectory):
+                    cprint(job + " only has " + str(len(trajectory)) + " frames.", "light_red")
+                    continue
+                frameNumber = frame % len(trajectory)
+                outputName = fileCreation(baseName, Defaults.coordExtension, "_frame" + str(frameNumber + 1))
+                trajectory.exportXYZ(outputName, slice(frameNumber, frameNumber + 1))
+            else:
+                outputName = fileCreation(baseName, Defaults.coordExtension, Defaults.trajectoryExtra)
+                frameCount = trajectory.exportXYZ(outputName, slice(None, None, every))
+                cprint("Wrote " + str(frameCount) + " of " + str(len(trajectory)) + " frames to " + outputName,
+                       "light_cyan")
+
+# Gaussian cube files, with the volumetric data as a NumPy array. The text grid is parsed once, in chunks, and kept in
+# a .npy sidecar next to the cube, so every later read memory-maps the sidecar instead. Grids are stored in Bohr,
+# shaped (x, y, z), or (x, y, z, orbital) for MO cubes, and support +, -, and * between cubes on the same grid
+class CubeFile:
+    def __init__(self, fileName=None):
+        self.fileName = fileName
+        self.comments = ["", ""]
+        self.origin = None
+        self.axes = None
+        self.shape = ()
+        self.atomicNumbers = None
+        self.nuclearCharges = None
+        self.coordinates = None
+        self.orbitals = []
+        self.headerExtra = []
+        self.data = None
+        if fileName is not None:
+            self.read(fileName)
+
+    def read(self, fileName):
+        import numpy
+        with open(fileName, 'rb') as inFile:
+            with closing(mmap(inFile.fileno(), 0, access=ACCESS_READ)) as data:
+                self.comments = [data.readline().decode().rstrip("\n"), data.readline().decode().rstrip("\n")]
+                fields = data.readline().decode().split()
+                atomCount = int(fields[0])
+                self.origin = numpy.array(fields[1:4], dtype=numpy.float64)
+                self.headerExtra = fields[4:]
+                counts, axes = [], []
+                for axis in range(3):
+                    fields = data.readline().decode().split()
+                    counts.append(int(fields[0]))
+                    axes.append([float(value) for value in fields[1:4]])
+                self.axes = numpy.array(axes)
+                atoms = numpy.array([data.readline().decode().split()[:5] for atom in range(abs(atomCount))],
+                                    dtype=numpy.float64).reshape(-1, 5)
+                self.atomicNumbers = atoms[:, 0].astype(numpy.int8)
+                self.nuclearCharges = atoms[:, 1].copy()
+                self.coordinates = numpy.ascontiguousarray(atoms[:, 2:])
+                # Negative voxel counts mean the axes, origin, and atoms are in Angstroms
+                if counts[0] < 0:
+                    self.axes /= Defaults.bohrToAngstrom
+                    self.origin /= Defaults.bohrToAngstrom
+                    self.coordinates /= Defaults.bohrToAngstrom
+                # MO cubes list their orbitals after the atoms, possibly over several lines
+                self.orbitals = []
+                if atomCount < 0:
+                    fields = data.readline().decode().split()
+                    orbitalCount = int(fields[0])
+                    fields = fields[1:]
+                    while len(fields) < orbitalCount:
+                        fields += data.readline().decode().split()
+                    self.orbitals = [int(orbital) for orbital in fields[:orbitalCount]]
+                self.shape = tuple(abs(count) for count in counts) + ((len(self.orbitals),) if len(self.orbitals) > 1
+                                                                      else ())
+                self.fileName = fileName
+                self.data = self.cachedGrid(data, data.tell())
+
+    # Loads the grid from the sidecar if it is newer than the cube, otherwise parses the text and writes the sidecar
+    def cachedGrid(self, data, dataStart):
+        import numpy
+        sidecarName = self.fileName + Defaults.cubeCacheExtension
+        try:
+            if os.path.getmtime(sidecarName) >= os.path.getmtime(self.fileName):
+                grid = numpy.load(sidecarName, mmap_mode="r")
+                if grid.shape == self.shape:
+                    return grid
+        except (OSError, ValueError):
+            pass
 
-        outputFile.write(str(len(at))+"\nPointless Comment Line\n")
-        for k in range(len(at)):
-            # Ensures the list elements are integers for dictionary pairing
-            at[k] = int(at[k])
-            # Translates from Atomic Number to Atomic Symbol and builds the entire line to be written with proper formatting
-            coordLine = str(atSymbol[at[k]]) + "   " + str(X[k]) + "   " + str(Y[k]) + "   " + str(Z[k]) + "\n"
-            coordLine = coordLine.replace(' ', ' ')
-            outputFile.write(coordLine)
-            coordinateList.append(coordLine)
-    return coordinateList
+        grid = numpy.empty(int(numpy.prod(self.shape)), dtype=numpy.float64)
+        filled = 0
+        pointer = dataStart
+        while pointer < len(data) and filled < len(grid):
+            chunkEnd = data.find(b"\n", min(pointer + Defaults.cubeChunkSize, len(data)))
+            if chunkEnd == -1:
+                chunkEnd = len(data)
+            values = numpy.fromstring(data[pointer:chunkEnd].decode(), dtype=numpy.float64, sep=" ")
+            values = values[:len(grid) - filled]
+            grid[filled:filled + len(values)] = values
+            filled += len(values)
+            pointer = chunkEnd + 1
+        if filled != len(grid):
+            cprint("Warning: " + self.fileName + " holds " + str(filled) + " of " + str(len(grid)) + " grid values.",
+                   "light_red")
+        grid = grid.reshape(self.shape)
+        # The sidecar is only a cache, so a read-only directory just means parsing again next time
+        try:
+            temporaryName = sidecarName + "." + str(os.getpid()) + Defaults.cubeCacheExtension
+            numpy.save(temporaryName, grid)
+            os.replace(temporaryName, sidecarName)
+        except OSError:
+            pass
+        return grid
+
+    # A new cube on the same grid and atoms with different data
+    def withData(self, data):
+        newCube = copy.copy(self)
+        newCube.fileName = None
+        newCube.data = data
+        return newCube
+
+    def sameGrid(self, other):
+        import numpy
+        return (self.shape == other.shape and numpy.allclose(self.origin, other.origin)
+                and numpy.allclose(self.axes, other.axes))
+
+    def combine(self, other, operation):
+        if isinstance(other, CubeFile):
+            if not self.sameGrid(other):
+                raise ValueError("Cubes " + str(self.fileName) + " and " + str(other.fileName) + " are on different grids")
+            other = other.data
+        return self.withData(operation(self.data, other))
+
+    def __add__(self, other):
+        return self.combine(other, lambda left, right: left + right)
+
+    def __sub__(self, other):
+        return self.combine(other, lambda left, right: left - right)
+
+    def __mul__(self, other):
+        return self.combine(other, lambda left, right: left * right)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    # Slices the grid like a NumPy array, in grid points
+    def __getitem__(self, index):
+        return self.data[index]
+
+    # Volume of one voxel in cubic Bohr
+    def voxelVolume(self):
+        import numpy
+        return abs(numpy.linalg.det(self.axes))
+
+    # Integrates the grid (per orbital for MO cubes), returning the total, positive, and negative parts
+    def integrate(self):
+        import numpy
+        volume = self.voxelVolume()
+        spatialAxes = (0, 1, 2)
+        positive = numpy.where(self.data > 0, self.data, 0).sum(axis=spatialAxes) * volume
+        negative = numpy.where(self.data < 0, self.data, 0).sum(axis=spatialAxes) * volume
+        return positive + negative, positive, negative
+
+    # Writes the cube back out in Gaussian's layout, six values a line and a new line for every z column, a block of
+    # rows at a time so the formatted text never has to exist all at once
+    def write(self, fileName):
+        import numpy
+        atomCount = -len(self.atomicNumbers) if len(self.orbitals) != 0 else len(self.atomicNumbers)
+        rowLength = int(numpy.prod(self.shape[2:]))
+        rowFormat = (Defaults.cubeValueFormat * 6 + "\n") * (rowLength // 6)
+        if rowLength % 6 != 0:
+            rowFormat += Defaults.cubeValueFormat * (rowLength % 6) + "\n"
+        rows = numpy.asarray(self.data).reshape(-1, rowLength)
+        with open(fileName, "w") as outFile:
+            outFile.write(self.comments[0] + "\n" + self.comments[1] + "\n")
+            outFile.write("%5d%12.6f%12.6f%12.6f" % ((atomCount,) + tuple(self.origin))
+                          + "".join("%5s" % field for field in self.headerExtra) + "\n")
+            for count, axis in zip(self.shape[:3], self.axes):
+                outFile.write("%5d%12.6f%12.6f%12.6f\n" % ((count,) + tuple(axis)))
+            for atomicNumber, charge, position in zip(self.atomicNumbers, self.nuclearCharges, self.coordinates):
+                outFile.write("%5d%12.6f%12.6f%12.6f%12.6f\n" % ((atomicNumber, charge) + tuple(position)))
+            if len(self.orbitals) != 0:
+                orbitalFields = [len(self.orbitals)] + self.orbitals
+                for start in range(0, len(orbitalFields), 10):
+                    outFile.write("".join("%5d" % field for field in orbitalFields[start:start + 10]) + "\n")
+            for start in range(0, len(rows), Defaults.cubeWriteRows):
+                block = rows[start:start + Defaults.cubeWriteRows]
+                outFile.write((rowFormat * len(block)) % tuple(block.ravel().tolist()))
+        self.fileName = fileName
+
+# Prints the integral of every listed cube, per orbital for MO cubes, e.g. the number of unpaired electrons from a
+# spin density
+def integrateCubes(cubeList):
+    for cubeName in cubeList:
+        try:
+            cube = CubeFile(cubeName)
+        except (ValueError, IndexError):
+            cprint("Could not read " + cubeName + " as a cube file.", "light_red")
+            continue
+        total, positive, negative = cube.integrate()
+        labels = [str(orbital) for orbital in cube.orbitals] if cube.data.ndim == 4 else [""]
+        for index, label in enumerate(labels):
+            values = [float(value) if cube.data.ndim == 3 else float(value[index]) for value in (total, positive,
+                                                                                                  negative)]
+            cprint(cubeName + (" MO " + label if len(label) != 0 else "") + ": " + "%.6f" % values[0] + " (positive "
+                   + "%.6f" % values[1] + ", negative " + "%.6f" % values[2] + ")", "light_cyan")
+
+# Writes the first cube minus every other cube to FIRST_diff.cube, e.g. a density difference
+def differenceCubes(cubeList):
+    if len(cubeList) < 2:
+        cprint("A cube difference needs at least two cubes.", "light_red")
+        return
+    try:
+        difference = CubeFile(cubeList[0])
+        for cubeName in cubeList[1:]:
+            difference = difference - CubeFile(cubeName)
+    except (ValueError, IndexError) as error:
+        cprint("Could not take the difference: " + str(error) + ". Aborting.", "light_red")
+        return
+    baseName, extension = grabPaths(cubeList[0])
+    outputName = fileCreation(baseName, Defaults.cubeExtension, Defaults.cubeDifferenceExtra)
+    difference.comments = [difference.comments[0], "Difference of " + " - ".join(cubeList)]
+    difference.write(outputName)
+    cprint("Wrote " + outputName, "light_green")
+
+# Single-pass scanner for Gaussian16 outputs. Finds charge, multiplicity, route line, the last geometry, the last
+# convergence table, stability, SCF energies, and termination in one read instead of one mmap per property.
+# Passing a previous scan resumes from where it stopped, so an output that only grew costs a parse of the new tail
+def outputScanner(fileName, scan=None):
+    if scan is None:
+        scan = OutputScan()
+    with open(fileName, 'r') as inFile:
+        if os.fstat(inFile.fileno()).st_size <= scan.offset:
+            return scan
+        with closing(mmap(inFile.fileno(), 0, access=ACCESS_READ)) as data:
+            # Stops at the last complete line, anything after it is still being written
+            limit = data.rfind(b"\n") + 1
+            # Concurrent lets the stalker parse several outputs at once from its threads
+            for match in outputPatterns().finditer(data, scan.offset, limit, concurrent=True):
+                match match.lastgroup:
+                    case "charge":
+                        # Only the first charge line belongs to the molecule, later ones come from guess fragments
+                        if scan.charge is None:
+                            scan.charge = match.group("chargeValue").decode()
+                            scan.multiplicity = match.group("multiplicityValue").decode()
+                    case "orientation":
+                        # Only the location is stored, getCoords decodes the final block once scanning finishes
+                        scan.orientationOffset = match.start()
+                        scan.orientationCount += 1
+                    case "route":
+                        if len(scan.route) == 0:
+                            route = routeFinder(data, match.end(), limit)
+                            if route is None:
+                                scan.offset = match.start()
+                                return scan
+                            scan.route = route
+                    case "table":
+                        data.seek(match.end())
+                        data.readline()
+                        convergeMet = []
+                        for index in range(0,4):
+                            convergeLine = data.readline().decode().split()
+                            if len(convergeLine) > 4:
+                                convergeMet.append(convergeLine[4])
+                        # The table is still being written, so it is picked up again from its header next time
+                        if data.tell() > limit:
+                            scan.offset = match.start()
+                            return scan
+                        scan.convergeCount = convergeMet.count("YES")
+                        scan.convergeCycles += 1
+                    case "stability":
+                        scan.hasStability = True
+                    case "stable":
+                        scan.isStable = True
+                    case "scf":
+                        scan.scfEnergies.append(float(match.group("scfValue")))
+                    case "termination":
+                        scan.termination = match.group().decode().lower()
+                    # Compound jobs (opt freq) terminate once per step, the next Link1 step means it isn't over yet
+                    case "nextStep":
+                        scan.termination = ""
+            scan.offset = limit
+    return scan
+
+# Pulls the route section out of the lines following "Will use up to". Long routes are wrapped by Gaussian16 across
+# several lines, which are stitched back together until the closing dashed line. Returns None if that line hasn't
+# been written yet
+def routeFinder(data, pointer, limit):
+    data.seek(pointer)
+    data.readline()
+    routeLines = []
+    for index in range(0,10):
+        line = data.readline().decode()
+        if len(line) == 0 or data.tell() > limit:
+            return None
+        if len(routeLines) == 0:
+            if line.strip().startswith("#"):
+                routeLines.append(line.strip())
+        elif line.strip().startswith("---"):
+            break
+        else:
+            routeLines.append(line.strip())
+    return "".join(routeLines)
+
+# Opens the parse cache once per process and thread, since neither forked pipeline workers nor the stalker's parsing
+# threads can share a connection
+def cacheConnection():
+    owner = (os.getpid(), threading.get_ident())
+    if owner not in parseCache:
+        connection = sqlite3.connect(Defaults.cacheFile, timeout=30)
+        connection.execute("CREATE TABLE IF NOT EXISTS scans (path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, "
+                           "inode INTEGER, tailCheck INTEGER, scan TEXT)")
+        parseCache[owner] = connection
+    return parseCache[owner]
+
+# Checksum of the last kilobyte before a given size, used to tell an output that grew from one that was overwritten
+def tailChecksum(fileName, size):
+    with open(fileName, 'rb') as inFile:
+        inFile.seek(max(size - 1024, 0))
+        return zlib.crc32(inFile.read(min(size, 1024)))
+
+# outputScanner backed by the on-disk parse cache. An unchanged output (same size, mtime, and inode) costs a stat,
+# an output that only grew is scanned from where the cached scan stopped, anything else is scanned from scratch
+def cachedScanner(fileName):
+    fileStat = os.stat(fileName)
+    fullPath = os.path.realpath(fileName)
+    try:
+        connection = cacheConnection()
+        row = connection.execute("SELECT size, mtime, inode, tailCheck, scan FROM scans WHERE path = ?",
+                                 (fullPath,)).fetchone()
+    except sqlite3.Error:
+        return outputScanner(fileName)
+
+    scan = None
+    if row is not None and row[2] == fileStat.st_ino:
+        if row[0] == fileStat.st_size and row[1] == fileStat.st_mtime_ns:
+            scan = OutputScan()
+            scan.__dict__.update(json.loads(row[4]))
+            return scan
+        if row[0] < fileStat.st_size and row[3] == tailChecksum(fileName, row[0]):
+            scan = OutputScan()
+            scan.__dict__.update(json.loads(row[4]))
+    scan = outputScanner(fileName, scan)
+
+    try:
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO scans VALUES (?, ?, ?, ?, ?, ?)",
+                               (fullPath, fileStat.st_size, fileStat.st_mtime_ns, fileStat.st_ino,
+                                tailChecksum(fileName, fileStat.st_size), json.dumps(vars(scan))))
+    except sqlite3.Error:
+        cprint("Notice: Could not write to the parse cache at " + Defaults.cacheFile, "light_red")
+    return scan
+
+# Opens the job registry, once per process and thread like the parse cache. Registries written by older versions are
+# brought up to date by adding whatever columns they are missing
+def registryConnection():
+    owner = (os.getpid(), threading.get_ident())
+    if owner not in jobRegistry:
+        connection = sqlite3.connect(Defaults.registryFile, timeout=30)
+        connection.execute("CREATE TABLE IF NOT EXISTS jobs (" + ", ".join(name + " " + columnType
+                           for name, columnType in registryColumns) + ")")
+        existingColumns = [row[1] for row in connection.execute("PRAGMA table_info(jobs)")]
+        with connection:
+            for name, columnType in registryColumns:
+                if name not in existingColumns:
+                    connection.execute("ALTER TABLE jobs ADD COLUMN " + name + " " + columnType)
+        jobRegistry[owner] = connection
+    return jobRegistry[owner]
+
+# Records submitted jobs in the registry by SLURM job ID. Takes
+# (jobId, jobName, outputPath, moleculeName, methodIndex, program, cpus, ram, wallTime, atoms) tuples
+def registerJobs(jobList):
+    try:
+        connection = registryConnection()
+        with connection:
+            connection.executemany("INSERT OR REPLACE INTO jobs (jobId, jobName, outputPath, directory, submitTime, "
+                                   "molecule, methodIndex, program, cpus, ram, wallTime, status, method, atoms) "
+                                   "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   [(jobId, jobName, os.path.abspath(outputPath), os.getcwd(), time.time(),
+                                     moleculeName, methodIndex, program, int(cpus), int(ram), wallTime, "SUBMITTED",
+                                     methodName(methodIndex), atoms)
+                                    for jobId, jobName, outputPath, moleculeName, methodIndex, program, cpus, ram,
+                                    wallTime, atoms in jobList])
+    except sqlite3.Error:
+        cprint("Notice: Could not write to the job registry at " + Defaults.registryFile, "light_red")
+
+# Updates the status of registered jobs from (jobId, status, startTime, endTime) tuples. Start and end times are only
+# filled in once, so they can be passed as None whenever they aren't known
+def updateJobs(updateList):
+    if len(updateList) == 0:
+        return
+    try:
+        connection = registryConnection()
+        with connection:
+            connection.executemany("UPDATE jobs SET status = ?, startTime = COALESCE(startTime, ?), "
+                                   "endTime = COALESCE(endTime, ?) WHERE jobId = ?",
+                                   [(status, startTime, endTime, jobId)
+                                    for jobId, status, startTime, endTime in updateList])
+    except sqlite3.Error:
+        cprint("Notice: Could not write to the job registry at " + Defaults.registryFile, "light_red")
+
+# The ID SLURM knows a registered job by, which for a job run inside a pack is the pack's
+def slurmJobId(jobId):
+    return jobId.split(Defaults.packSeparator)[0]
+
+# The benchmarking.txt method a job was generated from, None for jobs that weren't
+def methodName(methodIndex):
+    if methodIndex is None or methodIndex >= len(methodLine):
+        return None
+    return methodLine[methodIndex]
+
+def atomCount(molecule):
+    if molecule.atomicNumbers is None:
+        return None
+    return len(molecule.atomicNumbers)
+
+# Fills in how long finished jobs actually ran. sacct decides which jobs are finished, the output's own Elapsed time
+# or TOTAL RUN TIME gives the time where it terminated normally, and sacct's elapsed time covers outputs that are gone.
+# The registry status stands in when sacct can't be reached. Jobs that will never have a usable time are marked -1 so
+# they are only looked at once
+def harvestTimings():
+    try:
+        connection = registryConnection()
+        rows = connection.execute("SELECT jobId, outputPath, status FROM jobs WHERE elapsed IS NULL").fetchall()
+    except sqlite3.Error:
+        return
+    if len(rows) == 0:
+        return
+
+    accountingIndex = {}
+    jobIds = sorted({slurmJobId(row[0]) for row in rows})
+    for start in range(0, len(jobIds), Defaults.accountingChunk):
+        result = runCommand(["sacct", "-n", "-X", "-P", "-j", ",".join(jobIds[start:start + Defaults.accountingChunk]),
+                             "--format=JobID,State,ElapsedRaw"])
+        for line in (result.stdout or "").splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and len(fields[1]) != 0:
+                accountingIndex[fields[0]] = (fields[1].split()[0], fields[2])
+
+    timings = []
+    for jobId, outputPath, status in rows:
+        state, accountingElapsed = accountingIndex.get(slurmJobId(jobId), (status, ""))
+        # SLURM only knows how long a whole pack took, so jobs inside one are timed by their outputs alone
+        if slurmJobId(jobId) != jobId:
+            accountingElapsed = ""
+        # Registries written before statuses were normalized can still hold ORCA's TERMINATED NORMALLY
+        if state == "COMPLETED" or state.lower() in Defaults.terminationVariants[:2]:
+            energies = None
+            if os.path.isfile(outputPath) and os.path.getsize(outputPath) > 0:
+                energies = energyScanner(outputPath)
+            if energies is not None and energies["wallTime"] is not None:
+                if energies["termination"] in Defaults.terminationVariants[:2]:
+                    timings.append((energies["wallTime"], jobId))
+                else:
+                    timings.append((-1, jobId))
+            elif accountingElapsed.isdigit():
+                timings.append((float(accountingElapsed), jobId))
+            else:
+                timings.append((-1, jobId))
+        elif state == "TIMEOUT" and accountingElapsed.isdigit():
+            timings.append((float(accountingElapsed) * Defaults.timeoutFactor, jobId))
+        elif state in Defaults.failedStates or state == "TIMEOUT":
+            timings.append((-1, jobId))
+    try:
+        with connection:
+            connection.executemany("UPDATE jobs SET elapsed = ? WHERE jobId = ?", timings)
+    except sqlite3.Error:
+        cprint("Notice: Could not write to the job registry at " + Defaults.registryFile, "light_red")
+
+# Fits every method's CPU time (elapsed time times cores, so jobs run on different core counts compare) to its atom
+# count as a power law, over every timed job in the registry. Methods with too few jobs, or all the same size, keep
+# the default exponent and only have the prefactor fitted
+def loadTimingModels():
+    global timingModels
+    if timingModels is None:
+        import numpy
+        timingModels = {}
+        harvestTimings()
+        try:
+            rows = registryConnection().execute("SELECT method, atoms, cpus, elapsed FROM jobs WHERE elapsed > 0 AND "
+                                                "atoms > 0 AND cpus > 0 AND method IS NOT NULL").fetchall()
+        except sqlite3.Error:
+            return timingModels
+        points = {}
+        for method, atoms, cpus, elapsed in rows:
+            points.setdefault(method, []).append((atoms, elapsed * cpus))
+        for method, methodPoints in points.items():
+            atoms, cpuSeconds = numpy.log(numpy.array(methodPoints, dtype=float)).T
+            if len(methodPoints) >= Defaults.calibrationMinimum and numpy.ptp(atoms) > 0:
+                exponent, logPrefactor = numpy.polyfit(atoms, cpuSeconds, 1)
+            else:
+                exponent = Defaults.timingExponent
+                logPrefactor = numpy.median(cpuSeconds - exponent * atoms)
+            spread = float(numpy.std(cpuSeconds - logPrefactor - exponent * atoms))
+            timingModels[method] = (float(logPrefactor), float(exponent), spread)
+    return timingModels
+
+# Predicts a job's walltime in hours from the runs of its method so far, None when there is nothing to go on
+def predictWallTime(molecule, cpus):
+    if not Defaults.wallTimePrediction or atomCount(molecule) is None:
+        return None
+    method = methodName(molecule.methodIndex)
+    if method is None:
+        return None
+    model = loadTimingModels().get(method)
+    if model is None:
+        return None
+    logPrefactor, exponent, spread = model
+    wallSeconds = math.exp(logPrefactor) * atomCount(molecule) ** exponent / int(cpus)
+    return wallSeconds / 3600 * max(Defaults.wallMargin, math.exp(Defaults.wallSigmas * spread))
+
+# The walltime a job asks SLURM for: the prediction from earlier runs of its method, else what the sizing model picked,
+# else the Defaults. Always rounded up to one of the wallTimeSteps and never past the Defaults
+def jobWallTime(molecule, cpus):
+    hours = predictWallTime(molecule, cpus)
+    if hours is None and molecule.wallTime is not None:
+        hours = float(molecule.wallTime)
+    if hours is None:
+        return Defaults.wallTime
+    return wallTimeStep(hours)
+
+def wallTimeStep(hours):
+    for step in Defaults.wallTimeSteps:
+        if step >= hours and step <= int(Defaults.wallTime):
+            return str(step)
+    return Defaults.wallTime
+
+# The program code from programs.txt that runs a given input extension
+def programCode(extensionType):
+    match extensionType:
+        case Defaults.gaussianExtension:
+            return "G16"
+        case Defaults.orcaExtension:
+            return "O"
+        case Defaults.qChemExtension:
+            return "Q"
+        case _:
+            return ""
+
+# Shows the whole campaign submitted from the current directory straight from the registry, without touching the
+# queue or any output. The pattern narrows it down by job name
+def campaignStatus(pattern):
+    try:
+        rows = registryConnection().execute("SELECT jobId, jobName, methodIndex, program, cpus, ram, submitTime, "
+                                            "startTime, endTime, status FROM jobs WHERE directory = ? "
+                                            "ORDER BY submitTime, jobId", (os.getcwd(),)).fetchall()
+    except sqlite3.Error:
+        cprint("Could not read the job registry at " + Defaults.registryFile, "light_red")
+        return
+    rows = [row for row in rows if fnmatch.fnmatch(row[1], pattern)]
+    if len(rows) == 0:
+        cprint("No jobs matching " + pattern + " were submitted from this directory.", "light_yellow")
+        return
+
+    statusCounts = {}
+    print(f"{'Job':<35} {'ID':<14} {'Method':<16} {'Program':<8} {'CPUs':>5} {'RAM':>5} {'Submitted':<17} "
+          f"{'Elapsed':>9}  Status")
+    for jobId, jobName, methodIndex, program, cpus, ram, submitTime, startTime, endTime, status in rows:
+        statusCounts[status] = statusCounts.get(status, 0) + 1
+        method = methodName(methodIndex) or ""
+        elapsed = ""
+        if startTime is not None:
+            elapsed = str(round(((endTime or time.time()) - startTime) / 3600, 2)) + "h"
+        submitted = time.strftime("%Y-%m-%d %H:%M", time.localtime(submitTime)) if submitTime else ""
+        line = (f"{jobName:<35} {jobId:<14} {method:<16} {program or '':<8} {cpus or '':>5} {ram or '':>5} "
+                f"{submitted:<17} {elapsed:>9}  {status}")
+        cprint(line, Defaults.statusColors.get(status, "light_red"))
+    summary = ", ".join(str(count) + " " + status.lower() for status, count in statusCounts.items())
+    cprint(str(len(rows)) + " jobs: " + summary, "light_cyan")
+
+# Submits a queue file and returns its SLURM job ID, or None if sbatch refused it. Multi-cluster submissions answer
+# with "ID;cluster", only the ID is kept
+def sbatchSubmit(queueName):
+    submission = runCommand(["sbatch", "--parsable", queueName])
+    if submission.returncode != 0 or len(submission.stdout.strip()) == 0:
+        cprint("sbatch refused " + queueName + ": " + submission.stderr.strip(), "light_red")
+        return None
+    return submission.stdout.strip().split(";")[0]
 
 # Handles extensions so I don't have to copypasta this
 def extensionGetter(method):
     global fileExtension
 
-    programTarget = ""
-    for x in range(len(methodList)):
-        if method == methodList[x]:
-            programTarget = targetProgram[x]
-    match programTarget:
-        case "G16":
-            fileExtension = Defaults.gaussianExtension
-        case "O":
-            fileExtension = Defaults.orcaExtension
-        case "Q":
-            fileExtension = Defaults.qChemExtension
-        case _:
-            cprint("Notice: One or more of your intended methods is not specified in programs file nor hardcoded. "
-                   "Defaulting to Gaussian16.","light_red")
-            fileExtension = Defaults.gaussianExtension
+    programTarget = methodPrograms.get(method, "")
+    if programTarget in Defaults.programExtensions:
+        fileExtension = Defaults.programExtensions[programTarget]
+    else:
+        cprint("Notice: One or more of your intended methods is not specified in programs file nor hardcoded. "
+               "Defaulting to Gaussian16.","light_red")
+        fileExtension = Defaults.gaussianExtension
     return fileExtension
 
 # Gaussian16 Charge Finder in its own method
 def gaussianChargeFinder(geometryFile):
+    import regex
     chargeLine = "Charge"
     chargeLineBytes = chargeLine.encode()
     with open(geometryFile, 'r') as geomFile:
@@ -444,37 +1581,35 @@ def grabPaths(fileName):
         cprint("Could not locate: " + fileName, "light_red")
         return None, None
 
+# Builds every benchmark input for a molecule, starting with the original single point. Returns one Molecule per input
+# so that the submission stage can run them all at once
 def genBench(molecule):
     # First, make the original Single Point
-    genSinglePoint(molecule)
+    benchList = genSinglePoint(molecule)
     global indexOverride
     # Since methodFile is defined globally, no need to iterate a line to catch-up after genSinglePoint
-    startTime = time.time()
     if indexOverride != 0:
         indexShift = indexOverride + 1
     else:
         indexShift = 1
     for index in range(indexShift, len(methodLine)):
-        molecule.extensionType = extensionGetter(methodLine[index])
-        isSMD = regex.search("smd", fullMethodLine[index], regex.IGNORECASE)
-        if isSMD:
+        benchMolecule = copy.copy(molecule)
+        benchMolecule.extensionType = extensionGetter(methodLine[index])
+        if smdLines[index]:
             filemaskExtra = (f"-{index}-" + methodLine[index].replace("(", "").replace(")", "")
                 + "SMD" + Defaults.singlePointExtra)
         else:
             filemaskExtra = (f"-{index}-" + methodLine[index].replace("(","").replace(")","")
                 + Defaults.singlePointExtra)
-        inputFile = fileCreation(molecule.rootName, molecule.extensionType, filemaskExtra)
-        molecule.fullPath = inputFile
-        molecule.baseName = (molecule.rootName + filemaskExtra)
-        genFile(molecule,index)
-        runJob(molecule)
-    endTime = time.time()
-    totalTime = round(endTime - startTime,2)
-    cprint("Total time for non-SP benchmark generation is: " + str(totalTime) + " seconds.", "light_cyan")
-
+        inputFile = fileCreation(benchMolecule.rootName, benchMolecule.extensionType, filemaskExtra)
+        benchMolecule.fullPath = inputFile
+        benchMolecule.baseName = (benchMolecule.rootName + filemaskExtra)
+        genFile(benchMolecule,index)
+        benchList.append(benchMolecule)
+    return benchList
+
+# Builds the single point input for a molecule. Returns it in a list to match genBench
 def genSinglePoint(molecule):
-    startTime = time.time()
-
     # Update molecule properties
     molecule.extensionType = extensionGetter(methodLine[0])
     inputFile = fileCreation(molecule.baseName, molecule.extensionType, Defaults.singlePointExtra)
@@ -485,26 +1620,209 @@ def genSinglePoint(molecule):
     else:
         index = 0
 
-    # Calls the separate file generation method, feeds directly into runJob
+    # Calls the separate file generation method, submission is handled by the pipeline
     genFile(molecule, index)
-    runJob(molecule)
+    return [molecule]
+
+# Scrapes everything a job creation subroutine needs out of a Gaussian16 output. First stage of the pipeline
+@profiled("parse")
+def moleculeBuilder(job, coordExtra=""):
+    baseName, extension = grabPaths(job)
+    scan = cachedScanner(job)
+    atomicNumbers, coordinates = getCoords(job, baseName + coordExtra + Defaults.coordExtension, scan.orientationOffset)
+    newMolecule = Molecule(job, baseName, scan.charge, scan.multiplicity, atomicNumbers, coordinates, extension,
+                           baseName)
+    newMolecule.route = scan.route
+    newMolecule.convergeCount = scan.convergeCount
+    newMolecule.hasStability = scan.hasStability
+    newMolecule.isStable = scan.isStable
+    newMolecule.termination = scan.termination
+    newMolecule.scfEnergies = scan.scfEnergies
+    return newMolecule
+
+# Maps a function over a list, spread across a process pool when more than one worker is requested. Forking keeps the
+# flags and method lists set by commandLineParser available to every worker
+def pipelineMap(function, itemList):
+    if workerCount > 1 and len(itemList) > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workerCount, mp_context=multiprocessing.get_context("fork")) as pool:
+            return list(pool.map(function, itemList))
+    return [function(item) for item in itemList]
+
+# The job creation pipeline for single points and benchmarks. Parsing and input generation run concurrently for every
+# file in the list, then everything is submitted together at the end
+def jobPipeline(jobList, generator):
+    startTime = time.time()
+    moleculeList = pipelineMap(moleculeBuilder, jobList)
+    parseTime = time.time()
+    inputList = pipelineMap(generator, moleculeList)
+    generateTime = time.time()
+    for inputGroup in inputList:
+        for molecule in inputGroup:
+            runJob(molecule)
+    if isPack:
+        submitPacks()
+    if isBatch:
+        submitBatches()
     endTime = time.time()
-    totalTime = round(endTime - startTime,2)
-    cprint("Total single point time is " + str(totalTime) + " seconds.", "light_cyan")
+    # Per-molecule parse and generate spans stay in the worker processes, so the pool's wall time stands in for them
+    if profiler is not None and workerCount > 1:
+        profiler.record("parse pool", None, parseTime - startTime)
+        profiler.record("generate pool", None, generateTime - parseTime)
+
+    cprint("Parsed " + str(len(moleculeList)) + " outputs in " + str(round(parseTime - startTime,2)) + " seconds.",
+           "light_cyan")
+    cprint("Generated " + str(sum(len(inputGroup) for inputGroup in inputList)) + " inputs in "
+           + str(round(generateTime - parseTime,2)) + " seconds.", "light_cyan")
+    cprint("Submitted in " + str(round(endTime - generateTime,2)) + " seconds. Total pipeline time is "
+           + str(round(endTime - startTime,2)) + " seconds.", "light_cyan")
+
+# Sorts a route into one of the method classes the sizing model costs separately
+def methodClass(route):
+    route = route.upper()
+    for className, keyWords in Defaults.methodClasses.items():
+        if any(keyWord in route for keyWord in keyWords):
+            return className
+    return "dft"
+
+# Estimates how many basis functions a molecule has from its atoms and the zeta level of the basis set in the route
+def estimateBasisFunctions(atomicNumbers, route):
+    import numpy
+    route = route.upper()
+    if "QZ" in route:
+        zeta = 4
+    elif "TZ" in route or "311" in route:
+        zeta = 3
+    else:
+        zeta = 2
+    heavyFunctions, lightFunctions = Defaults.basisFunctionsPerAtom[zeta]
+    lightAtoms = int(numpy.count_nonzero(atomicNumbers <= 2))
+    basisFunctions = heavyFunctions * (len(atomicNumbers) - lightAtoms) + lightFunctions * lightAtoms
+    if "+" in route or "AUG-" in route:
+        basisFunctions *= Defaults.diffuseFactor
+    return basisFunctions
+
+# The sizing models from --calibrate where there are any, falling back to the Defaults for the rest
+def loadSizingModels():
+    global sizingModels
+    if sizingModels is None:
+        sizingModels = {className: list(model) for className, model in Defaults.sizingModels.items()}
+        try:
+            with open(Defaults.sizingFile, "r") as sizingFile:
+                for className, model in json.load(sizingFile).items():
+                    sizingModels[className] = model[:2]
+        except (FileNotFoundError, ValueError):
+            pass
+    return sizingModels
+
+# The sizing model's method class, basis function estimate, and CPU time for a molecule with a benchmarking.txt line
+def predictedCpuSeconds(molecule, index):
+    route = fullMethodLine[index]
+    className = methodClass(route)
+    basisFunctions = estimateBasisFunctions(molecule.atomicNumbers, route)
+    prefactor, exponent = loadSizingModels()[className]
+    return className, basisFunctions, prefactor * basisFunctions ** exponent
+
+# How long a job should run on a number of cores in hours, margin included: from earlier runs of its method where
+# there are any, otherwise from the sizing model. None for jobs that weren't generated from a molecule
+def estimatedHours(molecule, cpus):
+    hours = predictWallTime(molecule, cpus)
+    if hours is None and molecule.methodIndex is not None and atomCount(molecule) is not None:
+        hours = predictedCpuSeconds(molecule, molecule.methodIndex)[2] / int(cpus) / 3600 * Defaults.wallMargin
+    return hours
+
+# In pack mode, jobs short enough to share a pack are written for the cores of one lane
+def packCores(molecule, cores):
+    laneCores = max(1, Defaults.CPU // Defaults.packLanes)
+    if cores > laneCores:
+        hours = estimatedHours(molecule, laneCores)
+        if hours is not None and hours <= Defaults.packHours:
+            return laneCores
+    return cores
+
+# Picks the cores, memory per core (GB), and walltime (hours) of a job from its predicted CPU time. Small jobs get
+# fewer cores, large ones more memory, and memory that comes with cores on the HPC is bought with cores instead
+def sizeResources(molecule, index):
+    className, basisFunctions, cpuSeconds = predictedCpuSeconds(molecule, index)
+    if Defaults.wholeNode:
+        cores = Defaults.CPU
+    else:
+        cores = min(max(math.ceil(cpuSeconds / (Defaults.targetHours * 3600)), Defaults.minimumCPU), Defaults.CPU)
+    if className == "dft":
+        memoryPerCore = Defaults.memoryRatio
+    else:
+        memoryPerCore = Defaults.highMemoryRatio
+    memoryPerCore *= max(1, basisFunctions / Defaults.memoryBasis)
+    if Defaults.coreMemory is not None and memoryPerCore > Defaults.coreMemory:
+        cores = min(math.ceil(cores * memoryPerCore / Defaults.coreMemory), Defaults.CPU)
+        memoryPerCore = Defaults.coreMemory
+    # Never more than the node has, leaving room for the buffer slurmHandler adds on top
+    nodeMemory = Defaults.nodeMemory - Defaults.memoryBuffer
+    if cores * memoryPerCore > nodeMemory:
+        memoryPerCore = math.floor(nodeMemory / cores * 1000) / 1000
+
+    wallHours = min(max(math.ceil(cpuSeconds / cores / 3600 * Defaults.wallMargin), 1), int(Defaults.wallTime))
+    molecule.wallTime = str(wallHours)
+    return cores, memoryPerCore
+
+# Fits each method class's CPU time to basis functions as a power law over finished outputs, saving it for
+# --autoSize. Classes with too few outputs, or all the same size, keep their exponent and only have the prefactor fitted
+def calibrateSizing(jobList):
+    import numpy
+    points = {}
+    for energies in pipelineMap(energyScanner, jobList):
+        if (energies["termination"] not in Defaults.terminationVariants[:2] or energies["cpuTime"] is None
+                or energies["basisFunctions"] is None):
+            continue
+        points.setdefault(methodClass(energies["route"]), []).append((energies["basisFunctions"], energies["cpuTime"]))
+    if len(points) == 0:
+        cprint("None of the listed outputs finished with timings and basis set sizes to calibrate from.", "light_red")
+        return
+
+    calibration = {}
+    for className, classPoints in points.items():
+        basisFunctions, cpuSeconds = numpy.log(numpy.array(classPoints, dtype=float)).T
+        if len(classPoints) >= Defaults.calibrationMinimum and numpy.ptp(basisFunctions) > 0:
+            exponent, logPrefactor = numpy.polyfit(basisFunctions, cpuSeconds, 1)
+        else:
+            exponent = Defaults.sizingModels[className][1]
+            logPrefactor = numpy.median(cpuSeconds - exponent * basisFunctions)
+        calibration[className] = [float(numpy.exp(logPrefactor)), float(exponent), len(classPoints)]
+        cprint(f"{className:<16} CPU seconds = {calibration[className][0]:.3e} * N^{exponent:.2f} from "
+               f"{len(classPoints)} outputs", "light_cyan")
+
+    try:
+        with open(Defaults.sizingFile, "r") as sizingFile:
+            previous = json.load(sizingFile)
+    except (FileNotFoundError, ValueError):
+        previous = {}
+    previous.update(calibration)
+    with open(Defaults.sizingFile, "w") as sizingFile:
+        json.dump(previous, sizingFile)
+    cprint("Saved the sizing calibration to " + Defaults.sizingFile, "light_green")
 
 # Separate method for input file generation to improve code efficiency. No longer returns anything as path to input is
 # previously stored in molecule
+@profiled("generate")
 def genFile(molecule, index):
     global isCheck, isNBO
     inputFile = molecule.fullPath
-    mixedBasis = False
+    mixedBasis = mixedBasisLines[index]
+    molecule.methodIndex = index
     match molecule.extensionType:
         case Defaults.gaussianExtension:
-            # No longer accesses the XYZ file due to Molecule coordinateList property
+            # No longer accesses the XYZ file due to the Molecule coordinate arrays
             with open(inputFile, 'w') as jobInput:
                 # Sets the job's CPU and RAM
-                jobCPU = str(Defaults.CPU)
-                jobMem = str(Defaults.CPU * Defaults.memoryRatio)
+                if isAutoSize:
+                    cores, memoryPerCore = sizeResources(molecule, index)
+                else:
+                    cores, memoryPerCore = Defaults.CPU, Defaults.memoryRatio
+                if isPack:
+                    cores = packCores(molecule, cores)
+                jobCPU = str(cores)
+                jobMem = str(math.ceil(cores * memoryPerCore))
                 # Writes the standard Gaussian16 formatted opening
                 jobInput.write("%nprocshared=" + jobCPU + "\n%mem=" + jobMem + "GB")
                 if isCheck:
@@ -512,14 +1830,8 @@ def genFile(molecule, index):
                 # If the methodLine from benchmarking.txt is garbage, the calculation will fail. Not my fault.
                 jobInput.write("\n# " + fullMethodLine[index].replace("\n","") + "\n\nUseless Comment line\n\n")
                 jobInput.write(molecule.charge + " " + molecule.multiplicity + "\n")
-                # New mixed basis checking
-                for keyWord in fullMethodLine[index].split():
-                    if keyWord in Defaults.mixedBasisVariants:
-                        mixedBasis = True
-                        break
-                # Accessing the stored coordinate list is significantly faster in run-time than prior crappy implementation
-                for line in molecule.coordinateList:
-                    jobInput.write(line)
+                # The whole coordinate block is formatted at once from the stored coordinate array
+                jobInput.write(coordinateBlock(molecule.atomicNumbers, molecule.coordinates))
                 # Adds in mixed basis info from local file
                 if os.path.isfile("mixedbasis.txt") and mixedBasis:
                     jobInput.write("\n")
@@ -538,33 +1850,37 @@ def genFile(molecule, index):
             # Opens the job file
             with open(inputFile, 'w') as jobInput:
                 # Sets the job's CPU and RAM
-                jobCPU = str(Defaults.CPU)
-                if methodLine == "DLPNO-CCSD(T)":
-                    jobMem = str(Defaults.highMemoryRatio * 1000)
+                if isAutoSize:
+                    cores, memoryPerCore = sizeResources(molecule, index)
+                elif methodLine[index] == "DLPNO-CCSD(T)":
+                    cores, memoryPerCore = Defaults.CPU, Defaults.highMemoryRatio
                 else:
-                    jobMem = str(Defaults.memoryRatio * 1000)
+                    cores, memoryPerCore = Defaults.CPU, Defaults.memoryRatio
+                if isPack:
+                    cores = packCores(molecule, cores)
+                jobCPU = str(cores)
+                jobMem = str(int(memoryPerCore * 1000))
                 # Writes the standard ORCA formatted opening
                 jobInput.write("%pal nprocs " + jobCPU + "\nend" + "\n%maxcore " + jobMem)
                 # If the methodLine from benchmarking.txt is garbage, the calculation will fail. Not my fault.
                 jobInput.write("\n! " + fullMethodLine[index].replace("\n","") + "\n\n")
                 # ORCA is smart enough to read from an XYZ directly
                 jobInput.write(f"* xyz {molecule.charge} {molecule.multiplicity} \n")
-                for line in molecule.coordinateList:
-                    jobInput.write(line)
+                jobInput.write(coordinateBlock(molecule.atomicNumbers, molecule.coordinates))
                 jobInput.write("\n*")
 
         case Defaults.qChemExtension:
             pass
 
-# Reorganized! Now handles SLURM commands independently because of HPC cluster agnosticism
-def slurmHandler(molecule,queueName,outputName,firstFiveLines):
+# Pulls the CPU and RAM request out of the first five lines of an input, falling back to the Defaults if not found
+def resourceFinder(molecule, firstFiveLines):
     coresLine, ramLine, cpus, jobRam = "", "", 0, 0
     match molecule.extensionType:
         case Defaults.gaussianExtension:
             for line in firstFiveLines:
-                if regex.search(Defaults.coreLineVariants[0], line) or regex.search(Defaults.coreLineVariants[1], line):
+                if Defaults.coreLineVariants[0] in line or Defaults.coreLineVariants[1] in line:
                     coresLine = line
-                if regex.search(Defaults.ramLineVariants[0], line):
+                if Defaults.ramLineVariants[0] in line:
                     ramLine = line
             if len(coresLine) == 0:
                 cpus = Defaults.CPU
@@ -581,9 +1897,9 @@ def slurmHandler(molecule,queueName,outputName,firstFiveLines):
 
         case Defaults.orcaExtension:
             for line in firstFiveLines:
-                if regex.search(Defaults.coreLineVariants[2], line):
+                if Defaults.coreLineVariants[2] in line:
                     coresLine = line
-                if regex.search(Defaults.ramLineVariants[1], line):
+                if Defaults.ramLineVariants[1] in line:
                     ramLine = line
             if len(coresLine) == 0:
                 cpus = Defaults.CPU
@@ -602,9 +1918,9 @@ def slurmHandler(molecule,queueName,outputName,firstFiveLines):
 
         case Defaults.qChemExtension:
             for line in firstFiveLines:
-                if regex.search(Defaults.coreLineVariants[0], line) or regex.search(Defaults.coreLineVariants[1], line):
+                if Defaults.coreLineVariants[0] in line or Defaults.coreLineVariants[1] in line:
                     coresLine = line
-                if regex.search(Defaults.ramLineVariants[0], line):
+                if Defaults.ramLineVariants[0] in line:
                     ramLine = line
             if len(coresLine) == 0:
                 cpus = Defaults.CPU
@@ -622,29 +1938,91 @@ def slurmHandler(molecule,queueName,outputName,firstFiveLines):
         case _:
             cpus = Defaults.CPU
             jobRam = cpus * Defaults.memoryRatio + Defaults.memoryBuffer
+    return cpus, jobRam
+
+# Reorganized! Now handles SLURM commands independently because of HPC cluster agnosticism
+# An arraySize above 0 turns the script into a SLURM job array with tasks numbered from 1
+# Packs pass their own (cpus, ram) as resources instead of an input to read them from
+@profiled("queue script")
+def slurmHandler(molecule,queueName,outputName,firstFiveLines,arraySize=0,resources=None):
+    if resources is None:
+        cpus, jobRam = resourceFinder(molecule, firstFiveLines)
+    else:
+        cpus, jobRam = resources
+    wallTime = jobWallTime(molecule, cpus)
 
     with open(queueName, 'w') as outputFile:
         for line in Defaults.submissionList:
-            if regex.search("-J", line):
+            if "-J" in line:
                 outputFile.write(line + str(molecule.baseName) + "\n")
-            elif regex.search("-o", line):
+            elif "-o" in line:
                 outputFile.write(line + outputName + "\n")
-            elif regex.search("--ntasks", line):
+            elif "--ntasks" in line:
                 outputFile.write(line + str(cpus) + "\n")
-            elif regex.search("--mem", line):
+            elif "--mem" in line:
                 outputFile.write(line + str(jobRam) + "GB\n")
-            elif regex.search("-t", line):
-                outputFile.write(line + Defaults.wallTime + ":00:00\n")
-            elif regex.search("-p", line):
+            elif "-t" in line:
+                outputFile.write(line + wallTime + ":00:00\n")
+            elif "-p" in line:
                 outputFile.write(line + Defaults.partition + "\n")
-            elif regex.search("-M", line):
+            elif "-M" in line:
                 outputFile.write(line + Defaults.cluster + "\n")
             else:
                 outputFile.write(line + "\n")
+        if arraySize > 0:
+            outputFile.write(Defaults.arrayLine + str(arraySize) + "\n")
+    return cpus, jobRam, wallTime
+
+# Writes the program-specific body of a queue file. The redirect is only needed when several jobs share one SLURM
+# output file (job arrays), otherwise the program writes to the output named in the header
+def programLines(outputFile, extensionType, baseName, inputName, redirect=False):
+    match extensionType:
+        case Defaults.gaussianExtension:
+            for nonVariantLine in Defaults.gaussianNonVariant:
+                outputFile.write(nonVariantLine)
+            if redirect:
+                outputFile.write("\ng16 < " + inputName + " > " + baseName + Defaults.outputExtension + "\n\n")
+            else:
+                outputFile.write("\ng16 < " + inputName + "\n\n")
+
+        case Defaults.orcaExtension:
+            # Now runs in ORCA 6.0.1 instead of 4.2.0
+            for index in range(0,3):
+                outputFile.write(Defaults.orcaNonVariant[index])
+            outputFile.write("files=(" + str(baseName + Defaults.orcaExtension) + ")\n")
+            for index in range(3,8):
+                outputFile.write(Defaults.orcaNonVariant[index])
+            if redirect:
+                outputFile.write("$(which orca) " + str(baseName + Defaults.orcaExtension) + " > $SLURM_SUBMIT_DIR/"
+                                 + baseName + Defaults.outputExtension + "\n\n")
+            else:
+                outputFile.write("$(which orca) " + str(baseName + Defaults.orcaExtension) + "\n\n")
+            for index in range(8,10):
+                outputFile.write(Defaults.orcaNonVariant[index])
+
+        # This will need updated to the modern architecture at some point
+        case Defaults.qChemExtension:
+            outputFile.write("module purge\nmodule load qchem/6.3.0-pliu\n\n\n")
+            # This crap was in the original and I have no clue if it's still necessary
+            # output.write("export QCSCRATCH=$LOCAL\n")
+            # output.write("export QC=/ihome/pliu/xiq23/qchem/qchem_for_peng_20151014\n")
+            # output.write("export PATH=$PATH:$QC/bin\n")
+            # output.write("export QCAUX=/ihome/pliu/xiq23/qchem/qcaux4\n")
+            outputFile.write("# Change to working directory\n")
+            outputFile.write("cp $SLURM_SUBMIT_DIR/" + inputName + " $SLURM_SCRATCH\n")
+            outputFile.write("cd $SLURM_SCRATCH\n\n")
+            # No clue what this line is and if it's needed, it's not in the Q-Chem documentation
+            outputFile.write("df -h\n")
+
+            # Re-wrote the script in order to make this line *actually* match the Q-Chem documentation
+            # Re-wrote to allow nthreads to match ncpu since each thread only runs on 1 CPU (see Q-Chem manual)
+            # Do NOT specify outfile, it LITERALLY breaks shit for some reason
+            #outputFile.write("qchem -slurm -nt " + str(cpus) + " " + molecule.fullPath + " " + "\n")
+            outputFile.write("du -h\n\n")
 
 # This routine is for job submission to the cluster
 def runJob(molecule):
-    global isStalking, stalkingSet
+    global isStalking, stalkingSet, batchGroups
 
     # Sets up all the basic filenames for the rest of submission
     outputName = molecule.baseName + Defaults.outputExtension
@@ -667,122 +2045,220 @@ def runJob(molecule):
         for index in range(0,4):
             firstFiveLines.append(inputFile.readline().strip())
 
-        slurmHandler(molecule, queueName, outputName, firstFiveLines)
-
-        match molecule.extensionType:
-            case Defaults.gaussianExtension:
-                with open(queueName, 'a') as outputFile:
-                    for nonVariantLine in Defaults.gaussianNonVariant:
-                        outputFile.write(nonVariantLine)
-                    outputFile.write("\ng16 < " + molecule.fullPath + "\n\n")
-
-                os.system("sbatch " + queueName)
-                #os.remove(queueName)
-                cprint(f"Submitted job " + molecule.baseName + " to Gaussian16", "light_green")
-                if isStalking:
-                    molecule.fullPath = molecule.baseName + Defaults.outputExtension
-                    stalkingSet.add((molecule.baseName,molecule.fullPath))
-
-            case Defaults.orcaExtension:
-                with open(queueName, 'a') as outputFile:
-                    # Now runs in ORCA 6.0.1 instead of 4.2.0
-                    for index in range(0,3):
-                        outputFile.write(Defaults.orcaNonVariant[index])
-                    outputFile.write("files=(" + str(molecule.baseName + Defaults.orcaExtension) + ")\n")
-                    for index in range(3,8):
-                        outputFile.write(Defaults.orcaNonVariant[index])
-                    outputFile.write("$(which orca) " + str(molecule.baseName + Defaults.orcaExtension) + "\n\n")
-                    for index in range(8,10):
-                        outputFile.write(Defaults.orcaNonVariant[index])
-
-                os.system("sbatch " + queueName)
-                #os.remove(queueName)
-                cprint(f"Submitted job " + molecule.baseName + " to ORCA 6.0.1", "light_green")
-                if isStalking:
-                    molecule.fullPath = molecule.baseName + Defaults.outputExtension
-                    stalkingSet.add((molecule.baseName,molecule.fullPath))
-
-            # This will need updated to the modern architecture at some point
-            case Defaults.qChemExtension:
-                with open(queueName, 'a') as outputFile:
-                    outputFile.write("module purge\nmodule load qchem/6.3.0-pliu\n\n\n")
-                    # This crap was in the original and I have no clue if it's still necessary
-                    # output.write("export QCSCRATCH=$LOCAL\n")
-                    # output.write("export QC=/ihome/pliu/xiq23/qchem/qchem_for_peng_20151014\n")
-                    # output.write("export PATH=$PATH:$QC/bin\n")
-                    # output.write("export QCAUX=/ihome/pliu/xiq23/qchem/qcaux4\n")
-                    outputFile.write("# Change to working directory\n")
-                    outputFile.write("cp $SLURM_SUBMIT_DIR/" + molecule.fullPath + " $SLURM_SCRATCH\n")
-                    outputFile.write("cd $SLURM_SCRATCH\n\n")
-                    # No clue what this line is and if it's needed, it's not in the Q-Chem documentation
-                    outputFile.write("df -h\n")
-
-                    # Re-wrote the script in order to make this line *actually* match the Q-Chem documentation
-                    # Re-wrote to allow nthreads to match ncpu since each thread only runs on 1 CPU (see Q-Chem manual)
-                    # Do NOT specify outfile, it LITERALLY breaks shit for some reason
-                    #outputFile.write("qchem -slurm -nt " + str(cpus) + " " + molecule.fullPath + " " + "\n")
-                    outputFile.write("du -h\n\n")
-
-                os.system("sbatch " + queueName)
-                #os.remove(queueName)
-                cprint(f"Submitted job " + molecule.baseName + " to Q-Chem 6.3", "light_green")
-                if isStalking:
-                    molecule.fullPath = molecule.baseName + Defaults.outputExtension
-                    stalkingSet.add((molecule.baseName,molecule.fullPath))
+    # Pack mode queues every job short enough to share a pack for submitPacks(), the rest carry on as usual
+    if isPack and molecule.extensionType != Defaults.qChemExtension:
+        cpus, jobRam = resourceFinder(molecule, firstFiveLines)
+        hours = estimatedHours(molecule, cpus)
+        if hours is not None and hours <= Defaults.packHours and int(cpus) <= max(1, Defaults.CPU // Defaults.packLanes):
+            packQueue.append((molecule.baseName, molecule.rootName, molecule.methodIndex, atomCount(molecule),
+                              molecule.extensionType, int(cpus), int(jobRam), hours))
+            return
+
+    # Batch mode only files the job under its resource group, everything is submitted together by submitBatches()
+    # Q-Chem is left out until its queue file is brought up to the modern architecture
+    if isBatch and molecule.extensionType != Defaults.qChemExtension:
+        cpus, jobRam = resourceFinder(molecule, firstFiveLines)
+        groupKey = (molecule.extensionType, str(cpus), str(jobRam), jobWallTime(molecule, cpus))
+        if groupKey not in batchGroups:
+            batchGroups[groupKey] = ([], firstFiveLines)
+        batchGroups[groupKey][0].append((molecule.baseName, molecule.rootName, molecule.methodIndex,
+                                         atomCount(molecule)))
+        return
+
+    cpus, jobRam, wallTime = slurmHandler(molecule, queueName, outputName, firstFiveLines)
+
+    with open(queueName, 'a') as outputFile:
+        programLines(outputFile, molecule.extensionType, molecule.baseName, molecule.fullPath)
+
+    with profileSpan("submit", molecule.rootName):
+        jobId = sbatchSubmit(queueName)
+    #os.remove(queueName)
+    if jobId is None:
+        return
+    match molecule.extensionType:
+        case Defaults.gaussianExtension:
+            cprint(f"Submitted job " + molecule.baseName + " (" + jobId + ") to Gaussian16", "light_green")
+        case Defaults.orcaExtension:
+            cprint(f"Submitted job " + molecule.baseName + " (" + jobId + ") to ORCA 6.0.1", "light_green")
+        case Defaults.qChemExtension:
+            cprint(f"Submitted job " + molecule.baseName + " (" + jobId + ") to Q-Chem 6.3", "light_green")
+    registerJobs([(jobId, molecule.baseName, outputName, molecule.rootName, molecule.methodIndex,
+                   programCode(molecule.extensionType), cpus, jobRam, wallTime, atomCount(molecule))])
+    if isStalking:
+        molecule.fullPath = molecule.baseName + Defaults.outputExtension
+        stalkingSet.add((jobId,molecule.baseName,molecule.fullPath))
+
+# Submits everything runJob collected in batch mode as one SLURM job array per resource group. Each array reads the
+# base name of its task from a manifest file, so there is one queue file and one sbatch call per group
+def submitBatches():
+    global batchGroups, stalkingSet
+    timeStamp = time.strftime("%Y%m%d-%H%M%S")
+    for groupIndex, groupKey in enumerate(batchGroups):
+        extensionType = groupKey[0]
+        members, firstFiveLines = batchGroups[groupKey]
+        baseNames = [member[0] for member in members]
+        arrayName = "batch-" + timeStamp + "-" + str(groupIndex)
+        manifestName = arrayName + Defaults.manifestExtension
+        queueName = arrayName + Defaults.queueExtension
+
+        with open(manifestName, 'w') as manifestFile:
+            for baseName in baseNames:
+                manifestFile.write(baseName + "\n")
+
+        arrayMolecule = Molecule(manifestName, arrayName, 0, 0, None, None, extensionType, arrayName)
+        arrayMolecule.wallTime = groupKey[3]
+        slurmHandler(arrayMolecule, queueName, arrayName + "-%a" + Defaults.logExtension, firstFiveLines,
+                     len(baseNames))
+
+        with open(queueName, 'a') as outputFile:
+            # Bridges2 still runs its queue files through csh
+            if Defaults.hpcType == "Bridges2":
+                outputFile.write("\nset baseName = `sed -n \"${SLURM_ARRAY_TASK_ID}p\" " + manifestName + "`\n")
+            else:
+                outputFile.write("\nbaseName=$(sed -n \"${SLURM_ARRAY_TASK_ID}p\" " + manifestName + ")\n")
+            programLines(outputFile, extensionType, "${baseName}", "${baseName}" + extensionType, True)
+
+        with profileSpan("submit", arrayName):
+            arrayId = sbatchSubmit(queueName)
+        if arrayId is None:
+            continue
+        cprint("Submitted job array " + arrayName + " (" + arrayId + ") containing " + str(len(baseNames)) + " jobs.",
+               "light_green")
+        # Each task is known to SLURM as ARRAYID_TASK, numbered in manifest order from 1
+        taskList = [(arrayId + "_" + str(taskIndex + 1), baseName, baseName + Defaults.outputExtension)
+                    for taskIndex, baseName in enumerate(baseNames)]
+        registerJobs([task + (member[1], member[2], programCode(extensionType), groupKey[1], groupKey[2], groupKey[3],
+                              member[3])
+                      for task, member in zip(taskList, members)])
+        if isStalking:
+            stalkingSet.update(taskList)
+    batchGroups = {}
+
+# Submits everything runJob queued in pack mode. Jobs are placed longest first on the least loaded lane of the first
+# pack with room for them, so every pack is one SLURM job of up to packLanes lanes that finishes in about packHours.
+# Each pack's runner script starts every lane in the background and runs the jobs of a lane one after another
+def submitPacks():
+    global packQueue, stalkingSet
+    timeStamp = time.strftime("%Y%m%d-%H%M%S")
+    packs = []
+    for job in sorted(packQueue, key=lambda job: job[7], reverse=True):
+        for pack in packs:
+            lane = min(pack, key=lambda lane: lane[0])
+            if lane[0] + job[7] <= Defaults.packHours:
+                break
+        else:
+            pack = [[0.0, []] for lane in range(Defaults.packLanes)]
+            packs.append(pack)
+            lane = pack[0]
+        lane[0] += job[7]
+        lane[1].append(job)
+
+    laneCores = max(1, Defaults.CPU // Defaults.packLanes)
+    for packIndex, pack in enumerate(packs):
+        lanes = [lane for lane in pack if len(lane[1]) != 0]
+        packName = "pack-" + timeStamp + "-" + str(packIndex)
+        runnerName = packName + Defaults.packExtension
+        queueName = packName + Defaults.queueExtension
+
+        with open(runnerName, 'w') as runnerFile:
+            runnerFile.write("#!/bin/bash\n# " + str(len(lanes)) + " lanes of " + str(laneCores) + " cores\n")
+            for laneIndex, lane in enumerate(lanes):
+                runnerFile.write("\n# Lane " + str(laneIndex + 1) + "\n(\n")
+                # Every job gets its own subshell, since ORCA changes directory to the scratch space
+                for baseName, rootName, methodIndex, atoms, extensionType, cpus, ram, hours in lane[1]:
+                    runnerFile.write("(")
+                    programLines(runnerFile, extensionType, baseName, baseName + extensionType, True)
+                    runnerFile.write(")\n")
+                runnerFile.write(") &\n")
+            runnerFile.write("\nwait\n")
+
+        packMolecule = Molecule(runnerName, packName, 0, 0, None, None, Defaults.packExtension, packName)
+        packMolecule.wallTime = wallTimeStep(max(lane[0] for lane in lanes))
+        resources = (laneCores * len(lanes), sum(max(job[6] for job in lane[1]) for lane in lanes))
+        cpus, jobRam, wallTime = slurmHandler(packMolecule, queueName, packName + Defaults.logExtension, [],
+                                              resources=resources)
+        with open(queueName, 'a') as outputFile:
+            outputFile.write("\nbash " + runnerName + "\n")
+
+        with profileSpan("submit", packName):
+            packId = sbatchSubmit(queueName)
+        if packId is None:
+            continue
+        members = [job for lane in lanes for job in lane[1]]
+        cprint("Submitted pack " + packName + " (" + packId + ") running " + str(len(members)) + " jobs in "
+               + str(len(lanes)) + " lanes.", "light_green")
+        taskList = [(packId + Defaults.packSeparator + str(memberIndex + 1), job[0], job[0] + Defaults.outputExtension)
+                    for memberIndex, job in enumerate(members)]
+        registerJobs([task + (job[1], job[2], programCode(job[4]), job[5], job[6], wallTime, job[3])
+                      for task, job in zip(taskList, members)])
+        if isStalking:
+            stalkingSet.update(taskList)
+    packQueue = []
+
+# Builds a cubegen command for every requested cube of every molecule
+def cubeCommands(moleculeList, cubeKeyList, nproc):
+    commandList = []
+    for molecule in moleculeList:
+        for cubeKey in cubeKeyList:
+            outputName = fileCreation(molecule.baseName, Defaults.cubeExtension, cubeKey)
+            commandList.append(["cubegen", str(nproc), Defaults.cubeKeywords[cubeKey], molecule.fullPath, outputName,
+                                "0"])
+    return commandList
 
 # Better, interactive implementation of my own gimmeCubesv3
-def gimmeCubes(molecule, cubeKeyList):
-    keyWord, queueName, outputName = "", "", ""
-    for cubeKey in cubeKeyList:
-        match cubeKey:
-            case Defaults.spinCube:
-                outputName = fileCreation(molecule.baseName, Defaults.cubeExtension, cubeKey)
-                queueName = fileCreation(molecule.baseName, Defaults.queueExtension, cubeKey)
-                keyWord = "Spin=SCF"
-            case Defaults.denCube:
-                outputName = fileCreation(molecule.baseName, Defaults.cubeExtension, cubeKey)
-                queueName = fileCreation(molecule.baseName, Defaults.queueExtension, cubeKey)
-                keyWord = "Density=SCF"
-            case Defaults.potCube:
-                outputName = fileCreation(molecule.baseName, Defaults.cubeExtension, cubeKey)
-                queueName = fileCreation(molecule.baseName, Defaults.queueExtension, cubeKey)
-                keyWord = "Potential=SCF"
-            case Defaults.valenceCube:
-                outputName = fileCreation(molecule.baseName, Defaults.cubeExtension, cubeKey)
-                queueName = fileCreation(molecule.baseName, Defaults.queueExtension, cubeKey)
-                keyWord = "MO=Valence"
-            case _:
-                cprint("Error: Unknown keyword found in keylist for " + molecule.baseName + " : " + cubeKey, "light_red")
-
-        slurmHandler(molecule,queueName,outputName,[])
+# Submits one job per molecule that generates every requested cube in turn, each cubegen using all of the job's cores.
+# In batch mode every molecule goes into a single job instead
+def gimmeCubes(moleculeList, cubeKeyList):
+    if isBatch:
+        jobGroups = [("cubes-" + time.strftime("%Y%m%d-%H%M%S"), moleculeList)]
+    else:
+        jobGroups = [(molecule.baseName + Defaults.cubeJobExtra, [molecule]) for molecule in moleculeList]
+
+    for jobName, jobMolecules in jobGroups:
+        queueName = jobName + Defaults.queueExtension
+        logName = jobName + Defaults.logExtension
+        cubeJob = Molecule(queueName, jobName, 0, 0, None, None, Defaults.cubeExtension, jobName)
+        cpus, jobRam, wallTime = slurmHandler(cubeJob, queueName, logName, [])
 
         with open(queueName,"a") as queueFile:
             for nonVariantLine in Defaults.gaussianNonVariant:
                 queueFile.write(nonVariantLine)
+            # Writes the specifics for running every cube
+            for command in cubeCommands(jobMolecules, cubeKeyList, cpus):
+                queueFile.write(" ".join(command) + "\n")
+            queueFile.write("\n")
 
-            # Writes the specifics for running the Density Cube
-            queueFile.write("cubegen 1 " + keyWord + " " + molecule.fullPath + " " + outputName + " 0""\n\n")
-
-        os.system("sbatch " + queueName)
+        with profileSpan("submit", jobName):
+            jobId = sbatchSubmit(queueName)
         #os.remove(queueName)
-        cprint(f"Submitted cube job " + molecule.baseName + " " + cubeKey + " to the cluster.", "light_green")
+        if jobId is not None:
+            cprint("Submitted cube job " + jobName + " (" + jobId + ") for " + str(len(jobMolecules)) + " molecule(s), "
+                   + " ".join(cubeKeyList) + ", to the cluster.", "light_green")
+            moleculeName = jobMolecules[0].rootName if len(jobMolecules) == 1 else None
+            registerJobs([(jobId, jobName, logName, moleculeName, None, "cubegen", cpus, jobRam, wallTime, None)])
+
+# Generates the cubes right here instead of queueing them. The node's cores are split evenly between as many
+# concurrent cubegen runs as there are cubes, up to commandWorkers
+def localCubes(moleculeList, cubeKeyList):
+    coreCount = os.cpu_count() or 1
+    workers = max(1, min(Defaults.commandWorkers, coreCount, len(moleculeList) * len(cubeKeyList)))
+    commandList = cubeCommands(moleculeList, cubeKeyList, max(1, coreCount // workers))
+    environment = moduleEnvironment(Defaults.gaussianModules)
+    startTime = time.time()
+    with profileSpan("cubegen"):
+        results = runCommands(commandList, environment, workers)
+    successCount = sum(1 for result in results if result.returncode == 0)
+    cprint("Generated " + str(successCount) + " of " + str(len(commandList)) + " cubes in "
+           + str(round(time.time() - startTime, 2)) + " seconds.", "light_cyan")
 
 # Because jobs don't always work the first time
 def genReRun(molecule,skipIndex):
-    with open(molecule.fullPath,"r") as inputFile:
-        with closing(mmap(inputFile.fileno(),0,access=ACCESS_READ)) as data:
-            preTable = "Will use up to"
-            preBytes = preTable.encode()
-            originalMethod = regex.search(preBytes,data)
-            pointer = originalMethod.ends()
-            data.seek(pointer[0])
-            data.read(2)
-            for index in range(0,3):
-                data.readline()
-            originalMethod = data.readline().decode()
+    # The route line was already scraped by the output scanner when the molecule was built
+    originalMethod = molecule.route
 
     fullMethodLine[0] = originalMethod.replace("#","").strip()
     methodLine[0] = originalMethod.replace("#","").strip().split()[skipIndex]
+    smdLines[0], mixedBasisLines[0] = routeFlags(fullMethodLine[0])
     molecule.extensionType = extensionGetter(methodLine[0])
     inputFile = fileCreation(molecule.baseName, molecule.extensionType, Defaults.reRunExtra)
     molecule.fullPath = inputFile
@@ -790,124 +2266,466 @@ def genReRun(molecule,skipIndex):
 
     # Calls the separate file generation method, feeds directly into runJob
     genFile(molecule, 0)
+    # The method line came from the failed output rather than benchmarking.txt
+    molecule.methodIndex = None
     runJob(molecule)
 
-# Finally implemented in a way I can be proud of.
-def jobStalking(jobSet, duration, frequency):
+# Follows the tail of a stalked output between pings. The first look comes from the parse cache, after that only the
+# bytes appended since the previous ping are parsed
+def tailFollower(fileName, scanDict):
+    scan = scanDict.get(fileName)
+    if scan is None:
+        scan = cachedScanner(fileName)
+    elif os.path.getsize(fileName) < scan.offset:
+        # The output was overwritten by a new job, so the old state is thrown away
+        scan = outputScanner(fileName)
+    else:
+        scan = outputScanner(fileName, scan)
+    scanDict[fileName] = scan
+    return scan
+
+# Watches stalked outputs for growth. Uses inotify where the C library has it, and always stat-polls on top of that,
+# since inotify never hears about writes made by compute nodes to a network filesystem
+class OutputWatcher:
+    def __init__(self, fileList):
+        import ctypes
+        import ctypes.util
+        self.fileStats = {}
+        # Watched outputs by absolute path, which is how inotify events name them
+        self.absolutePaths = {}
+        self.watchDescriptor = None
+        self.watchedDirectories = {}
+        self.libc = None
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fileDescriptor = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fileDescriptor >= 0:
+                self.watchDescriptor = fileDescriptor
+        except (AttributeError, OSError, TypeError):
+            # No inotify on this system, stat-polling handles everything
+            self.watchDescriptor = None
+        for fileName in fileList:
+            self.add(fileName)
+
+    # Starts watching an output, along with its directory if inotify is available
+    def add(self, fileName):
+        if fileName in self.fileStats:
+            return
+        self.fileStats[fileName] = self.statFile(fileName)
+        self.absolutePaths[os.path.abspath(fileName)] = fileName
+        directory = os.path.dirname(os.path.abspath(fileName))
+        if self.watchDescriptor is not None and directory not in self.watchedDirectories.values():
+            directoryWatch = self.libc.inotify_add_watch(self.watchDescriptor, directory.encode(),
+                                                         Defaults.inotifyMask)
+            if directoryWatch >= 0:
+                self.watchedDirectories[directoryWatch] = directory
+
+    @staticmethod
+    def statFile(fileName):
+        try:
+            fileStat = os.stat(fileName)
+            return fileStat.st_size, fileStat.st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    # Stops watching an output, e.g. once its job has finished
+    def forget(self, fileName):
+        self.fileStats.pop(fileName, None)
+        self.absolutePaths.pop(os.path.abspath(fileName), None)
+
+    # Blocks for up to timeout seconds and returns the watched outputs that changed. Wakes immediately on inotify events
+    # and otherwise stat-polls every Defaults.watchPoll seconds
+    def wait(self, timeout):
+        changedFiles = set()
+        endTime = time.time() + timeout
+        while len(changedFiles) == 0 and time.time() < endTime:
+            waitTime = min(Defaults.watchPoll, max(endTime - time.time(), 0))
+            if self.watchDescriptor is not None:
+                readable = select.select([self.watchDescriptor], [], [], waitTime)[0]
+                if readable:
+                    changedFiles.update(self.readEvents())
+            else:
+                time.sleep(waitTime)
+            for fileName in self.fileStats:
+                currentStat = self.statFile(fileName)
+                if currentStat != self.fileStats[fileName]:
+                    self.fileStats[fileName] = currentStat
+                    changedFiles.add(fileName)
+        return changedFiles
+
+    # Unpacks the inotify_event structs waiting on the descriptor into the watched outputs they refer to
+    def readEvents(self):
+        changedFiles = set()
+        try:
+            buffer = os.read(self.watchDescriptor, 65536)
+        except BlockingIOError:
+            return changedFiles
+        pointer = 0
+        while pointer + 16 <= len(buffer):
+            directoryWatch, mask, cookie, nameLength = struct.unpack_from("iIII", buffer, pointer)
+            name = buffer[pointer + 16:pointer + 16 + nameLength].rstrip(b"\0").decode()
+            pointer += 16 + nameLength
+            fileName = self.absolutePaths.get(os.path.join(self.watchedDirectories.get(directoryWatch, ""), name))
+            if fileName is not None:
+                self.fileStats[fileName] = self.statFile(fileName)
+                changedFiles.add(fileName)
+        return changedFiles
+
+    def close(self):
+        if self.watchDescriptor is not None:
+            os.close(self.watchDescriptor)
+            self.watchDescriptor = None
+
+# Watch mode replacement for the sleep between queue pings. Every output that changes is parsed right away and a
+# termination is reported as soon as it is written. A job whose output has terminated can still be in the queue (the
+# next step of a compound job, or ORCA copying files back), so those jobs are held and the queue is asked about all of
+# them at once, a poll after the first termination and then twice as long after every snapshot that still finds one
+# queued. Whatever is still held when the interval ends is left to the next regular ping. Jobs in a pack share the
+# queue entry of the whole pack, so their termination is final once it has stood for a poll, without asking the queue
+async def watchOutputs(jobIndex, watcher, interval, stalkScans):
+    import asyncio
+    endTime = time.time() + interval
+    # Terminations of jobs still in the queue, by job ID
+    terminatedJobs = {}
+    snapshotDelay = Defaults.watchPoll
+    nextSnapshot = endTime
+    while len(jobIndex) != 0 and time.time() < endTime:
+        waitTime = endTime - time.time()
+        if len(terminatedJobs) != 0:
+            waitTime = min(waitTime, max(nextSnapshot - time.time(), 0))
+        changedFiles = await asyncio.to_thread(watcher.wait, waitTime)
+        changedJobs = [job for job in jobIndex.values() if job[2] in changedFiles and os.path.isfile(job[2])]
+        scanList = await asyncio.gather(*(asyncio.to_thread(tailFollower, job[2], stalkScans) for job in changedJobs))
+        for job, scan in zip(changedJobs, scanList):
+            if len(scan.termination) == 0:
+                terminatedJobs.pop(job[0], None)
+            else:
+                # A new termination starts the back off over
+                if job[0] not in terminatedJobs:
+                    if len(terminatedJobs) == 0:
+                        nextSnapshot = endTime
+                    snapshotDelay = Defaults.watchPoll
+                    nextSnapshot = min(nextSnapshot, time.time() + snapshotDelay)
+                terminatedJobs[job[0]] = scan.termination
+        if len(terminatedJobs) == 0 or time.time() < nextSnapshot:
+            continue
+
+        queuedJobs = [jobId for jobId in terminatedJobs if slurmJobId(jobId) == jobId]
+        queueIndex = {}
+        if len(queuedJobs) != 0:
+            queueIndex = await queueSnapshot(queuedJobs)
+        statusUpdates = []
+        for jobId in [jobId for jobId in terminatedJobs if jobId not in queueIndex]:
+            job = jobIndex.pop(jobId)
+            termination = terminatedJobs.pop(jobId)
+            terminationReport(job[1], termination)
+            statusUpdates.append((jobId, terminationStatus(termination), None, time.time()))
+            watcher.forget(job[2])
+        updateJobs(statusUpdates)
+        snapshotDelay *= 2
+        nextSnapshot = time.time() + snapshotDelay
+
+# Runs squeue for just the tracked job IDs without blocking the event loop, and indexes its lines by job ID. Array
+# tasks are listed one per line as ARRAYID_TASK. Each entry is [ID, NAME, STATUS, NODE/REASON, START_TIME, DURATION]
+async def queueSnapshot(jobIds):
+    import asyncio
+    queueFormat = "--format=%i|%j|%T|%R|%S|%M"
+    queueIds = ",".join(sorted({slurmJobId(jobId).split("_")[0] for jobId in jobIds}))
+    stalker = await asyncio.create_subprocess_exec("squeue", "-h", "-r", "-j", queueIds, queueFormat,
+                                                   stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    result = (await stalker.communicate())[0]
+    # SLURM refuses the whole list once any ID in it has been purged, so fall back to everything the user owns
+    if stalker.returncode != 0:
+        stalker = await asyncio.create_subprocess_exec("squeue", "-h", "-r", "--me", queueFormat,
+                                                       stdout=asyncio.subprocess.PIPE,
+                                                       stderr=asyncio.subprocess.DEVNULL)
+        result = (await stalker.communicate())[0]
+    queueIndex = {}
+    for line in result.decode("utf-8").splitlines():
+        fields = line.split("|")
+        if len(fields) == 6:
+            queueIndex[fields[0]] = fields
+    # Jobs in a pack share the queue entry of the pack
+    for jobId in jobIds:
+        if jobId not in queueIndex and slurmJobId(jobId) in queueIndex:
+            queueIndex[jobId] = queueIndex[slurmJobId(jobId)]
+    return queueIndex
+
+# Asks sacct how jobs that left the queue ended, for the ones whose outputs don't say
+async def accountingSnapshot(jobIds):
+    import asyncio
+    accounting = await asyncio.create_subprocess_exec("sacct", "-n", "-X", "-P", "-j",
+                                                      ",".join(sorted({slurmJobId(jobId) for jobId in jobIds})),
+                                                      "--format=JobID,State", stdout=asyncio.subprocess.PIPE,
+                                                      stderr=asyncio.subprocess.DEVNULL)
+    result = (await accounting.communicate())[0]
+    accountingIndex = {}
+    for line in result.decode("utf-8").splitlines():
+        fields = line.split("|")
+        if len(fields) == 2:
+            accountingIndex[fields[0]] = fields[1].split()[0]
+    for jobId in jobIds:
+        if jobId not in accountingIndex and slurmJobId(jobId) in accountingIndex:
+            accountingIndex[jobId] = accountingIndex[slurmJobId(jobId)]
+    return accountingIndex
+
+def terminationReport(jobName, termination):
+    if termination == Defaults.terminationVariants[2]:
+        cprint("Job " + str(jobName) + " has encountered " + Defaults.terminationVariants[2], "light_red")
+    else:
+        cprint("Job " + str(jobName) + " has encountered " + Defaults.terminationVariants[0], "light_green")
+
+# The registry status of a termination. ORCA's "terminated normally" is recorded as Gaussian16's normal termination so
+# that every success reads (and is coloured) the same
+def terminationStatus(termination):
+    if termination.lower() in Defaults.terminationVariants[:2]:
+        return Defaults.terminationVariants[0].upper()
+    return termination.upper()
+
+# Finally implemented in a way I can be proud of. Now rebuilt on asyncio so that one cycle costs one squeue call for
+# the tracked job IDs and a dictionary lookup per job, with every running output parsed concurrently. Watch mode reacts
+# to the outputs themselves between queue pings. Takes (jobId, jobName, outputPath) tuples
+def jobStalking(jobSet, duration, frequency, isWatching=False, refresh=None):
+    import asyncio
+    asyncio.run(stalkLoop(jobSet, duration, frequency, isWatching, refresh))
+
+async def stalkLoop(jobSet, duration, frequency, isWatching, refresh=None):
+    import asyncio
     startTime = time.time()
-    # Prints queue in format of JOBNAME STATUS NODE/REASON START_TIME CURRENT_DURATION courtesy of my own improved
-    # obsessiveQueuev2
-    command = ["squeue -h --me --format='%25j %10T %18R %S %20M'"]
-    finishedJobs = []
+    # Running parse state of every stalked output, kept between pings
+    stalkScans = {}
+    # Tagged jobs indexed by SLURM job ID
+    jobIndex = {job[0]: job for job in jobSet}
+    watcher = None
+    if isWatching:
+        watcher = OutputWatcher([job[2] for job in jobSet])
+
     # Repeats every frequency over duration
     while (time.time() - startTime) < duration * 60:
-        stalkStatus = set()
-        # Tells the function that jobs you submitted are the ones to track
-        for job in jobSet:
-            stalkStatus.add(job[0])
-        # Executes the qeueue command for further processing
-        stalker = subprocess.run(command, shell=True, capture_output=True)
-        result = stalker.stdout.splitlines()
-        for index in range(len(result)):
-            line = result[index].decode("utf-8")
-            # noinspection PyTypeChecker
-            result[index] = line
-            # Adds job basename to stalkStatus for comparison
-            stalkStatus.add(result[index].split()[0])
-
-        # The heart of the magic, iterates over the output of the queue command using JOBNAME, STATUS, and CURRENT_DURATION
-        for index in range(len(result)):
-            match result[index].split()[1]:
+        cycleStart = time.perf_counter()
+        # The daemon picks up whatever has been submitted since the last ping
+        if refresh is not None:
+            for job in refresh():
+                if job[0] not in jobIndex:
+                    jobIndex[job[0]] = job
+                    if watcher is not None:
+                        watcher.add(job[2])
+            cprint("Queue ping at " + time.strftime("%Y-%m-%d %H:%M:%S") + " for " + str(len(jobIndex)) + " jobs.",
+                   "light_blue")
+            if len(jobIndex) == 0:
+                cprint("All jobs tagged for stalking have finished.","light_cyan")
+                break
+        with profileSpan("queue ping"):
+            queueIndex = await queueSnapshot(list(jobIndex))
+
+        # The heart of the magic, matches the queue against the tagged jobs using STATUS and CURRENT_DURATION
+        runningJobs = []
+        finishedJobs = []
+        # Everything learned this cycle goes back into the job registry in one go
+        statusUpdates = []
+        for jobId, job in jobIndex.items():
+            fields = queueIndex.get(jobId)
+            if fields is None:
+                finishedJobs.append(job)
+                continue
+            match fields[2]:
                 case "PENDING":
-                    cprint("Job " + str(result[index].split()[0]) + " is currently pending. Expected start time is "
-                       + str(result[index].split()[3]), "light_yellow")
-                    stalkStatus.remove(result[index].split()[0])
+                    cprint("Job " + job[1] + " is currently pending. Expected start time is " + fields[4],
+                           "light_yellow")
+                    statusUpdates.append((jobId, "PENDING", None, None))
                 case "RUNNING":
-                    for job in jobSet:
-                        convergeCriteria = "Unknown"
-                        if job[0] == result[index].split()[0]:
-                            if os.path.isfile(job[1]) and os.path.getsize(job[1]) > 0:
-                                with open(job[1],'r+') as file:
-                                    with closing(mmap(file.fileno(),0,access=ACCESS_READ)) as data:
-                                        hasStability = "Stability analysis"
-                                        hasStabBytes = hasStability.encode()
-                                        isStable = "The wavefunction is already stable."
-                                        isStabBytes = isStable.encode()
-                                        containsStability = regex.search(hasStabBytes, data)
-                                        if containsStability is not None:
-                                            hasStabilized = regex.search(isStabBytes, data, regex.REVERSE)
-                                            if hasStabilized is not None:
-                                                stabilityInsert = "Wavefunction has stabilized."
-                                            else:
-                                                stabilityInsert = "Wavefunction has not stabilized."
-                                        else:
-                                            stabilityInsert = ""
-                                        # Checks for convergence section header, defaults to Unknown or Not Found
-                                        tableHeader = "         Item               Value     Threshold  Converged?"
-                                        tableBytes = tableHeader.encode()
-                                        finalTableHeader = regex.search(tableBytes, data, regex.REVERSE)
-                                        if finalTableHeader is not None:
-                                            if len(finalTableHeader.group().decode()) != 0:
-                                                convergeCriteria = 0
-                                                pointer = finalTableHeader.ends()
-                                                data.seek(pointer[0])
-                                                data.read(2)
-                                                convergeMet = []
-                                                for outdex in range(0,4):
-                                                    convergeLine = data.readline().decode()
-                                                    convergeMet.append(convergeLine.split()[4])
-                                                    convergeCriteria = convergeMet.count("YES")
-                                            cprint("Job " + str(result[index].split()[0]) + " is currently running, and "
-                                                "has converged on " + str(convergeCriteria) + " out of 4 criteria.\n    "
-                                                   + stabilityInsert + " Current duration is " + str(result[index].split()[4]),
-                                                   "light_magenta")
-                                            stalkStatus.remove(result[index].split()[0])
-                                        else:
-                                            cprint("Job " + str(result[index].split()[0]) + " is currently running. Convergence "
-                                                "criterion header not found.\n    " + stabilityInsert + " Current duration is "
-                                                   + str(result[index].split()[4]),"light_magenta")
-                                            stalkStatus.remove(result[index].split()[0])
-                            break
-
-        jobCopy = jobSet.copy()
-
-        # Finds how the job terminated and stores the data
-        for job in jobCopy:
-            # If the output is created during the execution of the subroutine, it won't be detected in the prior
-            # block and it will be size 0
-            if job[0] in stalkStatus and os.path.isfile(job[1]) and os.path.getsize(job[1]) > 0:
-                with open(job[1], "r+") as file:
-                    with closing(mmap(file.fileno(), 0, access=ACCESS_READ)) as data:
-                        for termination in Defaults.terminationVariants:
-                            termBytes = termination.encode()
-                            termLine = regex.search(termBytes, data, regex.IGNORECASE)
-                            if termLine is not None:
-                                finishedJobs.append((job[0], termination))
-                                break
-                jobSet.remove(job)
-            elif job[0] in stalkStatus and os.path.isfile(job[1]) and os.path.getsize(job[1]) == 0:
-                cprint("Job " + job[0] + " started running during stalk subroutine execution.", "light_magenta")
-
-        # Reports job termination data
+                    statusUpdates.append((jobId, "RUNNING", time.time(), None))
+                    if os.path.isfile(job[2]) and os.path.getsize(job[2]) > 0:
+                        runningJobs.append((job, fields))
+
+        # Parses every running output at once, each only from where the last ping stopped
+        scanList = await asyncio.gather(*(asyncio.to_thread(tailFollower, job[2], stalkScans)
+                                          for job, fields in runningJobs))
+        packedJobs = []
+        for (job, fields), scan in zip(runningJobs, scanList):
+            # The pack stays in the queue until its last lane is done, so its jobs finish on their termination alone
+            if slurmJobId(job[0]) != job[0] and len(scan.termination) != 0:
+                terminationReport(job[1], scan.termination)
+                statusUpdates.append((job[0], terminationStatus(scan.termination), None, time.time()))
+                packedJobs.append(job)
+                continue
+            if scan.hasStability:
+                if scan.isStable:
+                    stabilityInsert = "Wavefunction has stabilized."
+                else:
+                    stabilityInsert = "Wavefunction has not stabilized."
+            else:
+                stabilityInsert = ""
+            # Checks for convergence section header, defaults to Not Found
+            if scan.convergeCount is not None:
+                cprint("Job " + job[1] + " is currently running, and has converged on " + str(scan.convergeCount)
+                       + " out of 4 criteria after " + str(scan.convergeCycles) + " cycles.\n    " + stabilityInsert
+                       + " Current duration is " + fields[5], "light_magenta")
+            else:
+                cprint("Job " + job[1] + " is currently running. Convergence criterion header not found.\n    "
+                       + stabilityInsert + " Current duration is " + fields[5], "light_magenta")
+
+        # Finds how the jobs that left the queue terminated and reports it
+        finishedOutputs = [job for job in finishedJobs if os.path.isfile(job[2]) and os.path.getsize(job[2]) > 0]
+        scanList = await asyncio.gather(*(asyncio.to_thread(tailFollower, job[2], stalkScans)
+                                          for job in finishedOutputs))
+        unexplainedJobs = []
+        for job, scan in zip(finishedOutputs, scanList):
+            if len(scan.termination) != 0:
+                terminationReport(job[1], scan.termination)
+                statusUpdates.append((job[0], terminationStatus(scan.termination), None, time.time()))
+            else:
+                unexplainedJobs.append(job)
         for job in finishedJobs:
-            if job[1] == Defaults.terminationVariants[0] or job[1] == Defaults.terminationVariants[1]:
-                cprint("Job " + str(job[0]) + " has encountered " + Defaults.terminationVariants[0],"light_green")
-            if job[1] == Defaults.terminationVariants[2]:
-                cprint("Job " + str(job[0]) + " has encountered " + Defaults.terminationVariants[2], "light_red")
+            if job not in finishedOutputs:
+                unexplainedJobs.append(job)
+        # Timeouts, cancellations, and crashes never write a termination line
+        # Jobs sacct still has as pending or running were only missed by squeue, so they stay tagged
+        activeJobs = set()
+        if len(unexplainedJobs) != 0:
+            accountingIndex = await accountingSnapshot([job[0] for job in unexplainedJobs])
+            for job in unexplainedJobs:
+                accountingState = accountingIndex.get(job[0], "")
+                if accountingState in ("PENDING", "RUNNING"):
+                    # If the output is created during the execution of the subroutine, it will still be size 0
+                    if accountingState == "RUNNING":
+                        cprint("Job " + job[1] + " started running during stalk subroutine execution.",
+                               "light_magenta")
+                    else:
+                        cprint("Job " + job[1] + " is currently pending.", "light_yellow")
+                    statusUpdates.append((job[0], accountingState, None, None))
+                    activeJobs.add(job[0])
+                elif len(accountingState) != 0:
+                    cprint("Job " + job[1] + " left the queue with SLURM state " + accountingState, "light_red")
+                    statusUpdates.append((job[0], accountingState, None, time.time()))
+                else:
+                    # Nothing left to say how it ended, but it is finished as far as the registry is concerned
+                    statusUpdates.append((job[0], "UNKNOWN", None, time.time()))
+        updateJobs(statusUpdates)
+        for job in finishedJobs + packedJobs:
+            if job[0] in activeJobs:
+                continue
+            del jobIndex[job[0]]
+            if watcher is not None:
+                watcher.forget(job[2])
+        if profiler is not None:
+            profiler.record("stalk cycle", None, time.perf_counter() - cycleStart)
 
         # If all jobs for stalking are done, finish execution and release the terminal
-        if len(jobSet) == 0:
+        if len(jobIndex) == 0:
             cprint("All jobs tagged for stalking have finished.","light_cyan")
             break
 
         cprint("Waiting " + str(frequency*60) + " seconds to ping the queue again.","light_blue")
-        time.sleep(frequency * 60)
+        if watcher is None:
+            await asyncio.sleep(frequency * 60)
+        else:
+            await watchOutputs(jobIndex, watcher, frequency * 60, stalkScans)
+            if len(jobIndex) == 0:
+                cprint("All jobs tagged for stalking have finished.","light_cyan")
+                break
+
+    if watcher is not None:
+        watcher.close()
 
     # Timeout warning
     if (time.time() - startTime) > duration * 60:
         cprint("Job stalking terminated by timeout. Your jobs are still running.","light_red")
         cprint("Consider editing the default stalk duration and frequency if your jobs regularly timeout.","light_red")
 
+# Every registered job that hasn't been seen finishing yet, across every directory. This is the daemon's job list
+def registryJobs():
+    try:
+        return registryConnection().execute("SELECT jobId, jobName, outputPath FROM jobs WHERE status IN "
+                                            "('SUBMITTED', 'PENDING', 'RUNNING')").fetchall()
+    except sqlite3.Error:
+        return []
+
+# PID of the running stalking daemon, or None if there isn't one
+def daemonPid():
+    try:
+        with open(Defaults.daemonPidFile, "r") as pidFile:
+            pid = int(pidFile.readline().strip())
+        os.kill(pid, 0)
+        return pid
+    except (FileNotFoundError, ValueError, ProcessLookupError):
+        return None
+    except PermissionError:
+        # Someone else's process reusing an old PID
+        return None
+
+# Detaches a stalker from the terminal. It follows every unfinished job in the registry, so jobs submitted later from
+# any directory are picked up on its next ping, and it keeps its state in the registry and parse cache rather than in
+# memory. Output goes to the daemon log in ~/bin
+def startDaemon(isWatching):
+    runningPid = daemonPid()
+    if runningPid is not None:
+        cprint("The stalking daemon is already running (PID " + str(runningPid) + ") and will pick up these jobs on "
+               "its next ping.", "light_cyan")
+        return
+
+    firstChild = os.fork()
+    if firstChild != 0:
+        os.waitpid(firstChild, 0)
+        cprint("Stalking daemon started. Use --attach to follow it, or --status to see where your jobs are.",
+               "light_cyan")
+        return
+
+    # Double fork so the daemon is re-parented away from the terminal's session
+    os.setsid()
+    if os.fork() != 0:
+        os._exit(0)
+    with open(Defaults.daemonPidFile, "w") as pidFile:
+        pidFile.write(str(os.getpid()))
+    nullInput = os.open(os.devnull, os.O_RDONLY)
+    logOutput = os.open(Defaults.daemonLogFile, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    os.dup2(nullInput, 0)
+    os.dup2(logOutput, 1)
+    os.dup2(logOutput, 2)
+    sys.stdout.reconfigure(line_buffering=True)
+    exitCode = 0
+    try:
+        cprint("Stalking daemon started at " + time.strftime("%Y-%m-%d %H:%M:%S") + " (PID " + str(os.getpid()) + ")",
+               "light_cyan")
+        if isWatching:
+            jobStalking([], Defaults.daemonDuration, Defaults.watchFrequency, True, registryJobs)
+        else:
+            jobStalking([], Defaults.daemonDuration, Defaults.stalkFrequency, False, registryJobs)
+    # Nobody is left to see a crash but the log, and os._exit would otherwise swallow it
+    except Exception:
+        import traceback
+        sys.stderr.write("Stalking daemon stopped at " + time.strftime("%Y-%m-%d %H:%M:%S") + " after an error:\n"
+                         + traceback.format_exc())
+        sys.stderr.flush()
+        exitCode = 1
+    finally:
+        if daemonPid() == os.getpid():
+            os.remove(Defaults.daemonPidFile)
+        os._exit(exitCode)
+
+# Re-attaches the terminal to the daemon by following its log until Ctrl+C. Detaching never stops the daemon
+def attachDaemon():
+    runningPid = daemonPid()
+    if runningPid is None:
+        cprint("No stalking daemon is running. The end of its last log follows.", "light_yellow")
+    if not os.path.isfile(Defaults.daemonLogFile):
+        return
+    with open(Defaults.daemonLogFile, "r") as logFile:
+        for line in logFile.readlines()[-Defaults.attachLines:]:
+            print(line, end="")
+        if runningPid is None:
+            return
+        try:
+            while daemonPid() is not None:
+                line = logFile.readline()
+                if len(line) == 0:
+                    time.sleep(1)
+                else:
+                    print(line, end="")
+            cprint("The stalking daemon has finished.", "light_cyan")
+        except KeyboardInterrupt:
+            cprint("\nDetached. The stalking daemon is still running.", "light_cyan")
+
 # Because everyone hates remembering manuals. Walks through the most common use-cases with catch-all final custom keylist
 def goodVibesInteractive():
     keyList = []
@@ -947,9 +2765,10 @@ def goodVibesInteractive():
         finalKeyList = finalKeyList + " " + keyList[key]
     return finalKeyList
 
-# An improved version of goodVibesToExcelv3 that now properly formats the numbers in Excel as numbers
-def goodVibesProcessor(inputFile):
-    outputData = []
+# Streams the GoodVibes table out of its output one row at a time: the header first, then every structure as its name
+# followed by numbers. Anything that isn't a number (there shouldn't be any) is passed on as text
+def goodVibesRows(inputFile):
+    import regex
     header = "Structure"
     headerBytes = header.encode()
     with open(inputFile, 'r') as inFile:
@@ -957,32 +2776,342 @@ def goodVibesProcessor(inputFile):
             headerLocation = regex.search(headerBytes, data, regex.IGNORECASE)
             pointer = headerLocation.starts()
             data.seek(pointer[0])
-            line = data.readline()
-            tempSubs = line.decode().strip().split()
-            outputData.append(tempSubs)
+            yield data.readline().decode().strip().split()
             data.readline()
             line = data.readline().decode().strip()
-            while '*' not in line:
+            while '*' not in line and len(line) != 0:
                 subLines = line.split()
-                subLines.pop(0)
-                outputData.append(subLines)
+                row = [subLines[1]]
+                for value in subLines[2:]:
+                    try:
+                        row.append(float(value))
+                    except ValueError:
+                        row.append(value)
+                yield row
                 line = data.readline().decode().strip()
-    dataFrame = pandas.DataFrame(outputData)
-    # Sets the headers to the table header from GoodVibes
-    dataFrame.columns = dataFrame.iloc[0]
-    # Removes the header from the rest of the data
-    dataFrame = dataFrame[1:]
-    # This whole block is just to get the numbers to number properly
-    writer = pandas.ExcelWriter("GoodVibes.xlsx", engine='xlsxwriter', engine_kwargs={'options': {'strings_to_numbers': True}})
-    dataFrame.to_excel(writer, index=False)
-    workBook = writer.book
-    workSheet = writer.sheets['Sheet1']
-    formatNumber = workBook.add_format({'num_format': '#,##0.000000'})
-    workSheet.set_column('B:J', 12, formatNumber)
-    writer.close()
-
-commandLineParser()
-#print(sys.orig_argv)
-
-if isStalking:
-    jobStalking(stalkingSet, Defaults.stalkDuration, Defaults.stalkFrequency)
\ No newline at end of file
+
+# An improved version of goodVibesToExcelv3 that now properly formats the numbers in Excel as numbers
+def goodVibesProcessor(inputFile, outputFormat="xlsx"):
+    rows = goodVibesRows(inputFile)
+    header = next(rows)
+    exportRows(header, rows, Defaults.goodVibesOutput, outputFormat)
+
+# Writes a table of a text first column and numeric columns as it is produced, so tables of any size export in flat
+# memory: typed numbers through xlsxwriter in constant memory mode, CSV, or Parquet (which needs pyarrow) for
+# analysis elsewhere. Returns the number of rows written
+def exportRows(header, rows, outputBase, outputFormat):
+    outputName = outputBase + "." + outputFormat
+    rowCount = 0
+    match outputFormat:
+        case "xlsx":
+            import xlsxwriter
+            workBook = xlsxwriter.Workbook(outputName, {"constant_memory": True})
+            workSheet = workBook.add_worksheet()
+            formatNumber = workBook.add_format({'num_format': '#,##0.000000'})
+            workSheet.set_column(1, len(header) - 1, 12, formatNumber)
+            workSheet.write_row(0, 0, header)
+            for row in rows:
+                rowCount += 1
+                # Missing values are left as empty cells
+                for column, value in enumerate(row):
+                    if value is not None:
+                        workSheet.write(rowCount, column, value)
+            workBook.close()
+
+        case "csv":
+            import csv
+            with open(outputName, "w", newline="") as outFile:
+                csvWriter = csv.writer(outFile)
+                csvWriter.writerow(header)
+                for row in rows:
+                    rowCount += 1
+                    csvWriter.writerow(row)
+
+        case "parquet":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                cprint("Parquet export needs pyarrow. Install it in the compUtils environment, or use xlsx or csv.",
+                       "light_red")
+                return 0
+            # The first column is text and every other column is a float, with anything unreadable left empty
+            schema = pyarrow.schema([(header[0], pyarrow.string())]
+                                    + [(column, pyarrow.float64()) for column in header[1:]])
+            with pyarrow.parquet.ParquetWriter(outputName, schema) as parquetWriter:
+                batch = []
+                for row in rows:
+                    rowCount += 1
+                    batch.append(row)
+                    if len(batch) == Defaults.parquetBatchRows:
+                        parquetWriter.write_batch(parquetBatch(batch, schema))
+                        batch = []
+                if len(batch) != 0:
+                    parquetWriter.write_batch(parquetBatch(batch, schema))
+
+        case _:
+            cprint("Unknown export format " + outputFormat + ". Choose from xlsx, csv, or parquet.", "light_red")
+            return 0
+    cprint("Exported " + str(rowCount) + " rows to " + outputName, "light_cyan")
+    return rowCount
+
+# Turns a list of exported rows into a Parquet record batch, column by column
+def parquetBatch(batch, schema):
+    import pyarrow
+    columns = [[row[0] for row in batch]]
+    for index in range(1, len(schema)):
+        columns.append([row[index] if index < len(row) and isinstance(row[index], float) else None for row in batch])
+    return pyarrow.RecordBatch.from_arrays([pyarrow.array(column, type=field.type)
+                                            for column, field in zip(columns, schema)], schema=schema)
+
+# Pulls the energies of one Gaussian16 or ORCA output in a single pass: the last SCF energy (the PT2 corrected one for
+# double hybrids and MP2, or ORCA's final single point), DLPNO-CCSD(T) energy, zero-point and thermal corrections, and
+# the last set of frequencies. Runs in the worker processes, so it returns a plain dictionary
+def energyScanner(fileName):
+    energies = {"file": fileName, "scf": None, "ccsdt": None, "zpe": None, "thermalEnergy": None,
+                "thermalEnthalpy": None, "thermalGibbs": None, "imaginary": None, "lowestFrequency": None,
+                "wallTime": None, "cpuTime": None, "basisFunctions": None, "cores": None, "route": "",
+                "termination": ""}
+    frequencies = []
+    # Linked Gaussian16 jobs report their times once per link, so they are summed
+    wallTime, cpuTime, orcaProcesses = 0.0, 0.0, 1
+    with open(fileName, 'r') as inFile:
+        if os.path.getsize(fileName) == 0:
+            return energies
+        with closing(mmap(inFile.fileno(), 0, access=ACCESS_READ)) as data:
+            for match in energyPatterns().finditer(data, concurrent=True):
+                match match.lastgroup:
+                    case "scf" | "orcaFinal":
+                        energies["scf"] = float(match.group(match.lastgroup + "Value"))
+                    # Double hybrids and MP2 print their PT2 corrected energy after SCF Done, in Fortran D notation
+                    case "doubleHybrid" | "mp2":
+                        energies["scf"] = float(match.group(match.lastgroup + "Value").replace(b"D", b"E"))
+                    case "ccsdt":
+                        energies["ccsdt"] = float(match.group("ccsdtValue"))
+                    case "zpe" | "thermalEnergy" | "thermalEnthalpy" | "thermalGibbs":
+                        energies[match.lastgroup] = float(match.group(match.lastgroup + "Value"))
+                    case "orcaZpe":
+                        energies["zpe"] = float(match.group("orcaZpeValue"))
+                    case "orcaThermal":
+                        energies["thermalEnergy"] = float(match.group("orcaThermalValue"))
+                    case "orcaEnthalpy":
+                        energies["thermalEnthalpy"] = float(match.group("orcaEnthalpyValue"))
+                    case "orcaGibbs":
+                        energies["thermalGibbs"] = float(match.group("orcaGibbsValue"))
+                    # A new frequency calculation replaces the last one
+                    case "frequencyHeader" | "orcaFrequencyHeader":
+                        frequencies = []
+                    case "frequencies":
+                        frequencies.extend(float(value) for value in match.group("frequenciesValue").split())
+                    case "orcaFrequency":
+                        frequencies.append(float(match.group("orcaFrequencyValue")))
+                    case "cpuTime":
+                        cpuTime += durationSeconds(match.group("cpuTimeValue"))
+                    case "wallTime" | "orcaWallTime":
+                        wallTime += durationSeconds(match.group(match.lastgroup + "Value"))
+                    case "orcaProcesses":
+                        orcaProcesses = int(match.group("orcaProcessesValue"))
+                        energies["cores"] = orcaProcesses
+                    case "processors":
+                        energies["cores"] = int(match.group("processorsValue"))
+                    case "basis" | "orcaBasis":
+                        energies["basisFunctions"] = int(match.group(match.lastgroup + "Value"))
+                    # Only the first route is kept, ORCA's can span several ! lines
+                    case "route":
+                        if energies["route"] == "":
+                            energies["route"] = match.group("routeValue").decode().strip()
+                    case "orcaRoute":
+                        energies["route"] = (energies["route"] + " " + match.group("orcaRouteValue").decode()).strip()
+                    case "termination":
+                        energies["termination"] = match.group("termination").decode().lower()
+    # ORCA lists translations and rotations as zero frequencies
+    frequencies = [frequency for frequency in frequencies if frequency != 0]
+    if len(frequencies) != 0:
+        energies["imaginary"] = sum(1 for frequency in frequencies if frequency < 0)
+        energies["lowestFrequency"] = min(frequencies)
+    if wallTime != 0:
+        energies["wallTime"] = wallTime
+        # ORCA doesn't report CPU time, so it is charged as every requested core for the whole run
+        energies["cpuTime"] = cpuTime if cpuTime != 0 else wallTime * orcaProcesses
+    return energies
+
+# Converts a "0 days 1 hours 2 minutes 3.4 seconds" style duration, with ORCA's trailing msec, into seconds
+def durationSeconds(durationText):
+    values = [float(value) for value in durationText.split()[::2]]
+    return sum(value * unit for value, unit in zip(values, (86400, 3600, 60, 1, 0.001)))
+
+# Splits an output name into the structure it was generated from and the single point it is, following the names
+# genSinglePoint (ROOT_SP) and genBench (ROOT-INDEX-METHOD_SP, with SMD before _SP) give their inputs. Structure names
+# can have dashes and numbers of their own, so a split only counts where the method is the one benchmarking.txt has at
+# that index, trying the last one first. Anything else is a parent output with no label
+def siblingLabel(baseName):
+    import regex
+    if not baseName.endswith(Defaults.singlePointExtra) or len(baseName) == len(Defaults.singlePointExtra):
+        return baseName, None
+    stem = baseName[:-len(Defaults.singlePointExtra)]
+    for match in reversed(list(regex.finditer(r"-(?P<index>\d+)-(?P<method>.+)$", stem, overlapped=True))):
+        index = int(match.group("index"))
+        if match.start() == 0 or index >= len(methodLine):
+            continue
+        methodMask = methodLine[index].replace("(", "").replace(")", "")
+        if match.group("method") in (methodMask, methodMask + "SMD"):
+            return stem[:match.start()], match.group("index") + "-" + match.group("method")
+    return stem, Defaults.singlePointExtra.strip("_")
+
+# The best energy of a single point: DLPNO-CCSD(T) where ORCA ran it, otherwise the last SCF (or PT2) energy
+def singlePointEnergy(energies):
+    if energies["ccsdt"] is not None:
+        return energies["ccsdt"]
+    return energies["scf"]
+
+# Extracts energies from every listed output across the worker processes, then joins each structure to its single
+# point and benchmark siblings, giving one row per structure with the parent's electronic energy (PT2 corrected for
+# double hybrids and MP2) and corrections, and every sibling's energy plus that energy with the parent's Gibbs free
+# energy correction added
+def extractEnergies(jobList, outputFormat="xlsx"):
+    startTime = time.time()
+    energyList = pipelineMap(energyScanner, jobList)
+    scanTime = time.time()
+
+    parents = {}
+    siblings = {}
+    labels = set()
+    for energies in energyList:
+        baseName = os.path.basename(energies["file"]).rsplit(".", 1)[0]
+        if energies["termination"] != Defaults.terminationVariants[0] and energies["termination"] != \
+                Defaults.terminationVariants[1]:
+            cprint("Notice: " + energies["file"] + " has not terminated normally, its energies may be incomplete.",
+                   "light_red")
+        rootName, label = siblingLabel(baseName)
+        if label is None:
+            parents[baseName] = energies
+        else:
+            siblings.setdefault(rootName, {})[label] = energies
+            labels.add(label)
+
+    # Plain single points first, then benchmarks in benchmarking.txt order
+    labelOrder = sorted(labels, key=lambda label: (label != Defaults.singlePointExtra.strip("_"),
+                                                   int(label.split("-")[0]) if label[0].isdigit() else -1, label))
+    header = (["Structure", "Electronic Energy", "ZPE", "Thermal Energy Correction", "Thermal Enthalpy Correction",
+               "Thermal Gibbs Correction", "Imaginary Frequencies", "Lowest Frequency"]
+              + [prefix + "(" + label + ")" for label in labelOrder for prefix in ("E", "G")])
+
+    def energyRows():
+        for rootName in sorted(set(parents) | set(siblings)):
+            parent = parents.get(rootName, {})
+            row = [rootName] + [parent.get(key) for key in ("scf", "zpe", "thermalEnergy", "thermalEnthalpy",
+                                                             "thermalGibbs", "imaginary", "lowestFrequency")]
+            for label in labelOrder:
+                sibling = siblings.get(rootName, {}).get(label)
+                energy = singlePointEnergy(sibling) if sibling is not None else None
+                gibbs = None
+                if energy is not None and parent.get("thermalGibbs") is not None:
+                    gibbs = energy + parent["thermalGibbs"]
+                row += [energy, gibbs]
+            yield [float(value) if isinstance(value, int) else value for value in row]
+
+    rowCount = exportRows(header, energyRows(), Defaults.energiesOutput, outputFormat)
+    cprint("Scanned " + str(len(energyList)) + " outputs in " + str(round(scanTime - startTime, 2)) + " seconds into "
+           + str(rowCount) + " structures with " + str(len(labelOrder)) + " single points each.", "light_cyan")
+
+# Collects every benchmark output back into a structure by method matrix: energies relative to the structure the
+# reference method puts lowest (kcal/mol), each method's error against the reference (MAD, RMSD, and the largest
+# deviation), and what each method cost in wall and CPU hours. Writes the matrix as BenchMatrix and the cost against
+# accuracy table as BenchSummary
+def benchCollect(jobList, reference=Defaults.benchReference, outputFormat="xlsx"):
+    import numpy
+    energyList = pipelineMap(energyScanner, jobList)
+    # The plain single point is named after the method genSinglePoint ran, so the reference flag can pick it too
+    singlePointLabel = (str(indexOverride) + "-" + methodLine[indexOverride].replace("(", "").replace(")", "")
+                        if indexOverride < len(methodLine) else Defaults.singlePointExtra.strip("_"))
+    cells = []
+    for energies in energyList:
+        rootName, label = siblingLabel(os.path.basename(energies["file"]).rsplit(".", 1)[0])
+        if label == Defaults.singlePointExtra.strip("_"):
+            label = singlePointLabel
+        if label is not None:
+            cells.append((rootName, label, energies))
+    if len(cells) == 0:
+        cprint("No single point or benchmark outputs were found to collect.", "light_red")
+        return
+
+    # Benchmark indices follow benchmarking.txt, with the plain single point first
+    structureOrder = sorted({rootName for rootName, label, energies in cells})
+    methodOrder = sorted({label for rootName, label, energies in cells},
+                         key=lambda label: int(label.split("-")[0]) if label[0].isdigit() else -1)
+    structureRows = {rootName: row for row, rootName in enumerate(structureOrder)}
+    methodColumns = {label: column for column, label in enumerate(methodOrder)}
+    energyMatrix = numpy.full((len(structureOrder), len(methodOrder)), numpy.nan)
+    wallMatrix = numpy.full_like(energyMatrix, numpy.nan)
+    cpuMatrix = numpy.full_like(energyMatrix, numpy.nan)
+    for rootName, label, energies in cells:
+        row, column = structureRows[rootName], methodColumns[label]
+        if energies["termination"] not in Defaults.terminationVariants[:2]:
+            cprint("Notice: " + energies["file"] + " has not terminated normally and is left out.", "light_red")
+            continue
+        energy = singlePointEnergy(energies)
+        if energy is not None:
+            energyMatrix[row, column] = energy
+        if energies["wallTime"] is not None:
+            wallMatrix[row, column] = energies["wallTime"] / 3600
+            cpuMatrix[row, column] = energies["cpuTime"] / 3600
+
+    # The reference can be given with or without its index, and parentheses are dropped like they are in file names
+    referenceName = reference.replace("(", "").replace(")", "").lower()
+    referenceColumn = None
+    for column, label in enumerate(methodOrder):
+        if referenceName in (label.lower(), label.split("-", 1)[-1].lower()):
+            referenceColumn = column
+            break
+    if referenceColumn is None or numpy.all(numpy.isnan(energyMatrix[:, referenceColumn])):
+        cprint("Could not find any " + reference + " energies. Choose the reference method from: "
+               + ", ".join(methodOrder), "light_red")
+        return
+
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        baseline = int(numpy.nanargmin(energyMatrix[:, referenceColumn]))
+        relativeMatrix = (energyMatrix - energyMatrix[baseline]) * Defaults.hartreeToKcal
+        errorMatrix = relativeMatrix - relativeMatrix[:, [referenceColumn]]
+        # The baseline is zero for every method by construction, so it isn't a comparison
+        errorMatrix[baseline] = numpy.nan
+        compared = numpy.sum(~numpy.isnan(errorMatrix), axis=0)
+        absoluteErrors = numpy.where(numpy.isnan(errorMatrix), 0, numpy.abs(errorMatrix))
+        meanAbsolute = absoluteErrors.sum(axis=0) / compared
+        rootMeanSquare = numpy.sqrt((absoluteErrors ** 2).sum(axis=0) / compared)
+        maximumAbsolute = numpy.where(compared != 0, absoluteErrors.max(axis=0), numpy.nan)
+        timed = numpy.sum(~numpy.isnan(wallMatrix), axis=0)
+        meanWall = numpy.nansum(wallMatrix, axis=0) / timed
+        totalCpu = numpy.where(timed != 0, numpy.nansum(cpuMatrix, axis=0), numpy.nan)
+
+    def cleanRow(values):
+        return [None if numpy.isnan(value) else float(value) for value in values]
+
+    exportRows(["Structure"] + methodOrder,
+               ([rootName] + cleanRow(relativeMatrix[row]) for row, rootName in enumerate(structureOrder)),
+               Defaults.benchMatrixOutput, outputFormat)
+    summary = numpy.column_stack((meanAbsolute, rootMeanSquare, maximumAbsolute, compared, meanWall, totalCpu))
+    exportRows(["Method", "MAD", "RMSD", "Max Deviation", "Structures", "Mean Wall Hours", "CPU Hours"],
+               ([label] + cleanRow(summary[column]) for column, label in enumerate(methodOrder)),
+               Defaults.benchSummaryOutput, outputFormat)
+
+    cprint("Relative to " + structureOrder[baseline] + " against " + methodOrder[referenceColumn] + " (kcal/mol):",
+           "light_cyan")
+    print(f"{'Method':<30} {'MAD':>8} {'RMSD':>8} {'Max':>8} {'N':>4} {'Wall h':>8} {'CPU h':>9}")
+    for column, label in enumerate(methodOrder):
+        print(f"{label:<30} {meanAbsolute[column]:>8.2f} {rootMeanSquare[column]:>8.2f} {maximumAbsolute[column]:>8.2f} "
+              f"{compared[column]:>4} {meanWall[column]:>8.2f} {totalCpu[column]:>9.2f}")
+
+# Guarded so that worker processes and other scripts can import CompUtils without running it
+if __name__ == "__main__":
+    commandLineParser()
+    #print(sys.orig_argv)
+
+    if isDaemon:
+        startDaemon(isWatching)
+    elif isWatching:
+        jobStalking(stalkingSet, Defaults.stalkDuration, Defaults.watchFrequency, True)
+    elif isStalking:
+        jobStalking(stalkingSet, Defaults.stalkDuration, Defaults.stalkFrequency)
+
+    if profiler is not None:
+        profiler.report()
\ No newline at end of file
@@ -0,0 +1,36 @@
+# Checks that CubeFile keeps everything in Bohr, whatever units the cube was written in
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import compUtils
+
+# A 2x2x2 cube with one atom at x = 1, negative voxel counts when it is in Angstroms
+def cubeText(angstroms):
+    sign = "   -" if angstroms else "    "
+    return (" comment 1\n comment 2\n    1    0.000000    0.000000    0.000000\n"
+            + sign + "2    0.500000    0.000000    0.000000\n"
+            + sign + "2    0.000000    0.500000    0.000000\n"
+            + sign + "2    0.000000    0.000000    0.500000\n"
+            + "    6    6.000000    1.000000    0.000000    0.000000\n"
+            + " 0.1 0.2 0.3 0.4\n 0.5 0.6 0.7 0.8\n")
+
+def test_angstromCubeIsReadInBohr(tmp_path):
+    fileName = str(tmp_path / "angstrom.cube")
+    with open(fileName, "w") as cubeFile:
+        cubeFile.write(cubeText(True))
+    cube = compUtils.CubeFile(fileName)
+    assert cube.axes[0, 0] == pytest.approx(0.5 / compUtils.Defaults.bohrToAngstrom)
+    assert cube.coordinates[0, 0] == pytest.approx(1.0 / compUtils.Defaults.bohrToAngstrom)
+
+def test_angstromCubeRoundTrip(tmp_path):
+    fileName = str(tmp_path / "angstrom.cube")
+    with open(fileName, "w") as cubeFile:
+        cubeFile.write(cubeText(True))
+    compUtils.CubeFile(fileName).write(str(tmp_path / "bohr.cube"))
+    cube = compUtils.CubeFile(str(tmp_path / "bohr.cube"))
+    assert cube.axes[0, 0] == pytest.approx(0.5 / compUtils.Defaults.bohrToAngstrom, abs=1e-5)
+    assert cube.coordinates[0, 0] == pytest.approx(1.0 / compUtils.Defaults.bohrToAngstrom, abs=1e-5)
+    assert float(cube.data.sum()) == pytest.approx(3.6)
@@ -0,0 +1,36 @@
+# Checks that energyScanner reads the energy a method actually reports, on small synthetic Gaussian16 outputs
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import compUtils
+
+dashes = " " + "-" * 69 + "\n"
+
+# A single point as Gaussian16 writes one: SCF Done first, then for double hybrids (E2(B2PLYPD3) = ... E(B2PLYPD3) =
+# ...) and MP2 (E2 = ... EUMP2 = ...) the PT2 corrected energy in Fortran D notation
+def singlePointOutput(fileName, method, scfEnergy, correlatedEnergy=None):
+    with open(fileName, "w") as outFile:
+        outFile.write(" Entering Gaussian System\n Will use up to   12 processors via shared memory.\n")
+        outFile.write(dashes + " # " + method.lower() + "/def2tzvp\n" + dashes)
+        outFile.write(" SCF Done:  E(R" + method + ") =  %.9f     A.U. after   12 cycles\n" % scfEnergy)
+        if correlatedEnergy is not None:
+            label = "E2 =    -0.5000000000D+00 EUMP2" if method == "MP2" else \
+                "E2(" + method + ") =    -0.5000000000D+00 E(" + method + ")"
+            outFile.write(" " + label + " =    %.11fD+03\n" % (correlatedEnergy / 1000))
+        outFile.write(" Normal termination of Gaussian 16 at Mon Oct 27 10:00:00 2025.\n")
+
+@pytest.mark.parametrize("method", ["B2PLYPD3", "DSDPBEP86", "MP2"])
+def test_correlatedEnergyReplacesScf(tmp_path, method):
+    fileName = str(tmp_path / (method + ".log"))
+    singlePointOutput(fileName, method, -999.623456789, -1000.123456789)
+    energies = compUtils.energyScanner(fileName)
+    assert energies["scf"] == pytest.approx(-1000.123456789, abs=1e-8)
+    assert compUtils.singlePointEnergy(energies) == pytest.approx(-1000.123456789, abs=1e-8)
+
+def test_hybridKeepsScf(tmp_path):
+    fileName = str(tmp_path / "M062X.log")
+    singlePointOutput(fileName, "M062X", -999.623456789)
+    assert compUtils.energyScanner(fileName)["scf"] == pytest.approx(-999.623456789, abs=1e-8)